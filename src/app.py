@@ -31,8 +31,11 @@ from planner.agent_planner import plan_and_retrieve
 from risk.risk_engine import compute_risk_score
 from risk.explainer import explain_result
 from advisor.advisor_reasoner import generate_advisor_output
+from utils.diagnostics import setup_console_logging, start_request
 import json
 
+setup_console_logging()
+
 def main():
     print("=== Stock Risk Advisor — Full Pipeline ===")
     client = LLMClient()
@@ -43,6 +46,7 @@ def main():
         if q.lower() in ("exit","quit"):
             break
 
+        start_request()
         slots = sf.interactive_fill(q)
         context = plan_and_retrieve(slots)
         if "error" in context:
@@ -7,6 +7,7 @@ from .llm_client import LLMClient
 
 from utils.lang_detect import detect_lang
 from utils.schema import SlotFrame, find_missing_mandatory
+from utils.diagnostics import diag
 
 
 class SlotFiller:
@@ -42,24 +43,21 @@ class SlotFiller:
     # SLOT EXTRACTION
     # --------------------------------------------------
     def extract_slots(self, user_query: str):
-        print("\n================ SLOT FILLER START ================")
-        print("[SlotFiller] User query:", user_query)
+        diag("slots.query", lambda: {"query": user_query}, level="INFO")
 
         prompt = SLOT_EXTRACTION_PROMPT.format(query=user_query)
 
         raw = self.llm.complete(prompt, temperature=0.0)
 
-        print("\n[SlotFiller] RAW LLM OUTPUT ↓↓↓")
-        print(raw)
-        print("[SlotFiller] RAW LLM OUTPUT ↑↑↑\n")
+        diag("slots.llm_raw", lambda: {"raw": raw})
 
         parsed = self._parse_json(raw)
 
-        print("[SlotFiller] PARSED JSON:", parsed)
+        diag("slots.parsed", lambda: {"parsed": parsed})
 
         # ---------- FALLBACK ----------
         if parsed is None or not isinstance(parsed, dict):
-            print("[SlotFiller] ❌ JSON parsing failed. Using fallback.")
+            diag("slots.parse_failed", lambda: {"raw": raw}, level="INFO")
             parsed = {
                 "intent": None,
                 "stock_name": None,
@@ -92,7 +90,7 @@ class SlotFiller:
         for c in commodity_keywords:
             if c in q:
                 if parsed.get("intent") in ["price_trend", "risk_analysis", None]:
-                    print("[SlotFiller] ⚠️ Overriding intent → commodity_trend")
+                    diag("slots.override", lambda: {"from": parsed.get("intent"), "to": "commodity_trend"}, level="INFO")
                     parsed["intent"] = "commodity_trend"
                 parsed["commodity"] = c
                 parsed["stock_name"] = None
@@ -102,8 +100,7 @@ class SlotFiller:
         if not parsed.get("language"):
             parsed["language"] = detect_lang(user_query)
 
-        print("[SlotFiller] FINAL SLOTS:", parsed)
-        print("================ SLOT FILLER END =================\n")
+        diag("slots.final", lambda: {"slots": dict(parsed)}, level="INFO")
 
         return parsed
 
@@ -167,7 +164,8 @@ class SlotFiller:
             validated = SlotFrame(**slots)
             return validated.dict()
         except Exception as e:
-            print("[SlotFiller] ⚠️ Validation error, applying fallback:", e)
+            err = str(e)
+            diag("slots.validation_error", lambda: {"error": err, "slots": dict(slots)}, level="INFO")
 
             if not slots.get("language"):
                 slots["language"] = detect_lang(initial_query)
@@ -1,17 +1,140 @@
-from tools.price_tool import get_price_data
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Optional
+
+from tools.price_tool import get_price_data, get_price_data_batch
 from tools.fundamentals_tool import get_fundamentals
-from risk.risk_engine import compute_risk_score
+from risk.risk_engine import compute_risk_score, score_contexts
 from tools.ticker_resolver import resolve_ticker
 from tools.news_tool import get_sentiment
 from tools.rag_tool import get_static_context
+from tools.sentiment_model import finbert_loaded, preload_finbert
 from tools.commodity_resolver import resolve_commodity_symbol
 from tools.commodity_price_tool import get_commodity_price
 from tools.screener import run_screener
 from tools.competitor_search_tool import search_competitors
 from tools.sector_search_tool import search_sector_stocks
 from tools.web_search_tool import search_and_get_answer_advanced
+from utils.diagnostics import diag
+
+# Single-stock retrieval: the four tools run concurrently, each under its own timeout
+TOOL_WORKERS = int(os.getenv("PLAN_TOOL_WORKERS", "8"))
+TOOL_TIMEOUTS = {
+    "price_data": float(os.getenv("PLAN_TIMEOUT_PRICE_DATA", "20")),
+    "fundamentals": float(os.getenv("PLAN_TIMEOUT_FUNDAMENTALS", "15")),
+    "sentiment": float(os.getenv("PLAN_TIMEOUT_SENTIMENT", "20")),
+    "rag_context": float(os.getenv("PLAN_TIMEOUT_RAG_CONTEXT", "5")),
+}
+DEFAULT_TOOL_TIMEOUT = float(os.getenv("PLAN_TIMEOUT_DEFAULT", "20"))
+# Extra sentiment budget while FinBERT is still loading (first query after start)
+MODEL_LOAD_TIMEOUT = float(os.getenv("PLAN_TIMEOUT_MODEL_LOAD", "120"))
+# Used when a tool fails or times out; price_data has none and is required
+TOOL_DEFAULTS = {
+    "fundamentals": {},
+    "sentiment": {"sentiment": 0, "articles": []},
+    "rag_context": {"context": ""},
+}
+
+_tool_executor = None
+_tool_executor_lock = threading.Lock()
+
+def _get_tool_executor() -> ThreadPoolExecutor:
+    global _tool_executor
+
+    if _tool_executor is None:
+        with _tool_executor_lock:
+            if _tool_executor is None:
+                _tool_executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="plan-tool")
+
+    return _tool_executor
+
+
+def _tool_timeouts() -> dict:
+    """TOOL_TIMEOUTS, with the model load added to sentiment until FinBERT is up"""
+    timeouts = dict(TOOL_TIMEOUTS)
+    if not finbert_loaded():
+        preload_finbert()
+        timeouts["sentiment"] = timeouts.get("sentiment", DEFAULT_TOOL_TIMEOUT) + MODEL_LOAD_TIMEOUT
+    return timeouts
+
+
+def _fan_out(calls: dict, timeouts: Optional[dict] = None):
+    """
+    Run {name: (fn, *args)} concurrently on the shared tool executor.
+
+    Every call gets timeouts[name] seconds (default: TOOL_TIMEOUTS) from the
+    common start; a call that times out keeps running in the background and
+    its result is dropped.
+
+    Returns:
+        (results, errors, seconds) keyed by name; failed / timed-out calls
+        are only in errors
+    """
+    executor = _get_tool_executor()
+    started = time.perf_counter()
+    finished = {}
+
+    def timed(name, fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            finished[name] = round(time.perf_counter() - started, 3)
+
+    # copy_context keeps the request id for diagnostics recorded inside the tools
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, timed, name, *call)
+        for name, call in calls.items()
+    }
+
+    timeouts = timeouts or TOOL_TIMEOUTS
+    results, errors = {}, {}
+    for name, future in futures.items():
+        timeout = timeouts.get(name, DEFAULT_TOOL_TIMEOUT)
+        try:
+            results[name] = future.result(timeout=max(started + timeout - time.perf_counter(), 0))
+        except TimeoutError:
+            errors[name] = f"timed out after {timeout:g}s"
+        except Exception as e:
+            errors[name] = str(e) or type(e).__name__
+
+    return results, errors, dict(finished)
+
+
+def _resolve_tickers(names):
+    """[(name, ticker)] for every name that resolves, preferring NSE over BSE"""
+    resolved = []
+
+    for name in names:
+        resolver = resolve_ticker(name)
+        if not resolver:
+            continue
+
+        if resolver.get("NSE"):
+            resolved.append((name, resolver["NSE"] + ".NS"))
+        elif resolver.get("BSE"):
+            resolved.append((name, resolver["BSE"] + ".BO"))
+
+    return resolved
+
 
 def plan_and_retrieve(slots: dict):
+    started = time.perf_counter()
+    diag("plan.start", lambda: {"intent": slots.get("intent"), "slots": dict(slots)}, level="INFO")
+
+    context = _plan_and_retrieve(slots)
+
+    diag("plan.done", lambda: {
+        "mode": context.get("mode"),
+        "error": context.get("error"),
+        "seconds": round(time.perf_counter() - started, 3),
+    }, level="INFO")
+    return context
+
+
+def _plan_and_retrieve(slots: dict):
     intent = slots.get("intent")
     language = slots.get("language", "en")
 
@@ -66,21 +189,15 @@ def plan_and_retrieve(slots: dict):
 
         results = []
 
-        for stock in stock_names:
-            resolver = resolve_ticker(stock)
-            if not resolver:
-                continue
+        resolved = _resolve_tickers(stock_names)
+        prices = get_price_data_batch([ticker for _, ticker in resolved])
 
-            # Prefer NSE over BSE
-            if resolver.get("NSE"):
-                ticker = resolver["NSE"] + ".NS"
-            elif resolver.get("BSE"):
-                ticker = resolver["BSE"] + ".BO"
-            else:
+        for stock, ticker in resolved:
+            price_data = prices.get(ticker)
+            if price_data is None:
                 continue
 
             try:
-                price_data = get_price_data(ticker)
                 fundamentals = get_fundamentals(ticker)
                 sentiment = get_sentiment(stock)
                 static_ctx = get_static_context(stock)
@@ -156,42 +273,39 @@ def plan_and_retrieve(slots: dict):
         except Exception as e:
             return {"error": f"Competitor search failed: {e}"}
 
-        results = []
+        contexts = []
 
-        for comp in competitors:
-            resolver = resolve_ticker(comp)
-            if not resolver:
-                continue
+        resolved = _resolve_tickers(competitors)
+        prices = get_price_data_batch([ticker for _, ticker in resolved])
 
-            if resolver.get("NSE"):
-                ticker = resolver["NSE"] + ".NS"
-            elif resolver.get("BSE"):
-                ticker = resolver["BSE"] + ".BO"
-            else:
+        for comp, ticker in resolved:
+            price_data = prices.get(ticker)
+            if price_data is None:
                 continue
 
             try:
-                price_data = get_price_data(ticker)
                 fundamentals = get_fundamentals(ticker)
                 sentiment = get_sentiment(comp)
             except Exception:
                 continue
 
-            comp_context = {
+            contexts.append({
                 "stock": comp,
                 "ticker": ticker,
                 "price_data": price_data,
                 "fundamentals": fundamentals,
                 "sentiment": sentiment
-            }
-
-            risk = compute_risk_score(comp_context)
+            })
 
-            results.append({
-                "stock_name": comp,
-                "ticker": ticker,
+        # all competitors scored in one vectorized pass
+        results = [
+            {
+                "stock_name": ctx["stock"],
+                "ticker": ctx["ticker"],
                 "risk": risk
-            })
+            }
+            for ctx, risk in zip(contexts, score_contexts(contexts))
+        ]
 
         if not results:
             return {"error": "No competitor data available"}
@@ -214,7 +328,7 @@ def plan_and_retrieve(slots: dict):
             return {"error": "Sector name required"}
 
         stocks = search_sector_stocks(sector)
-        print("Stocks in agent_panner",stocks)
+        diag("plan.sector_stocks", lambda: {"sector": sector, "stocks": stocks})
         results = []
 
         # # for name in stocks:
@@ -277,37 +391,31 @@ def plan_and_retrieve(slots: dict):
             return {"error": "Sector name required"}
 
         stocks = search_sector_stocks(sector)
-        aggregate = []
+        contexts = []
 
-        for name in stocks:
-            resolver = resolve_ticker(name)
-            if not resolver:
-                continue
+        resolved = _resolve_tickers(stocks)
+        prices = get_price_data_batch([ticker for _, ticker in resolved])
 
-            if resolver.get("NSE"):
-                ticker = resolver["NSE"] + ".NS"
-            elif resolver.get("BSE"):
-                ticker = resolver["BSE"] + ".BO"
-            else:
+        for name, ticker in resolved:
+            price_data = prices.get(ticker)
+            if price_data is None:
                 continue
 
             try:
-                price_data = get_price_data(ticker)
                 fundamentals = get_fundamentals(ticker)
                 sentiment = get_sentiment(name)
             except Exception:
                 continue
 
-            ctx = {
+            contexts.append({
                 "stock": name,
                 "ticker": ticker,
                 "price_data": price_data,
                 "fundamentals": fundamentals,
                 "sentiment": sentiment
-            }
+            })
 
-            risk = compute_risk_score(ctx)
-            aggregate.append(risk["risk_score"])
+        aggregate = [risk["risk_score"] for risk in score_contexts(contexts)]
 
         if not aggregate:
             return {"error": "Insufficient data for sector trend"}
@@ -405,18 +513,19 @@ def plan_and_retrieve(slots: dict):
         "language": language
     }
 
-    try:
-        price_data = get_price_data(ticker)
-        fundamentals = get_fundamentals(ticker)
-        sentiment = get_sentiment(stock_name)
-        static_ctx = get_static_context(stock_name)
-    except Exception as e:
-        return {"error": str(e)}
-
-    context.update({
-        "price_data": price_data,
-        "fundamentals": fundamentals,
-        "sentiment": sentiment,
-        "rag_context": static_ctx
-    })
+    results, tool_errors, seconds = _fan_out({
+        "price_data": (get_price_data, ticker),
+        "fundamentals": (get_fundamentals, ticker),
+        "sentiment": (get_sentiment, stock_name),
+        "rag_context": (get_static_context, stock_name),
+    }, timeouts=_tool_timeouts())
+    diag("plan.tools", lambda: {"seconds": seconds, "errors": tool_errors})
+
+    if "price_data" in tool_errors:
+        return {"error": tool_errors["price_data"]}
+
+    context["price_data"] = results["price_data"]
+    context.update({name: results.get(name, default) for name, default in TOOL_DEFAULTS.items()})
+    if tool_errors:
+        context["tool_errors"] = tool_errors
     return context
@@ -0,0 +1,216 @@
+# src/risk/backtest.py
+"""
+Historical backtest of the risk score.
+
+Recomputes the indicators for every bar of a whole universe with the panel
+engine (tools/indicators.py), scores every (day, ticker) with the same
+compiled rule table as compute_risk_score, and reports what happened next:
+forward returns and forward max drawdown per risk class and horizon.
+
+Only the technical rules can fire historically: there is no point-in-time
+fundamentals or news history, so sentiment is neutral and PE / EPS / beta
+are left out unless --with-fundamentals is given (today's values for every
+day, which leaks the future - use it only to gauge the size of those rules).
+
+Bars come from the local bar store; --refresh tops it up first with
+grouped downloads.
+
+Usage (from src/):
+    python -m risk.backtest --years 10 --horizons 5 20 60
+    python -m risk.backtest --tickers INFY.NS TCS.NS --years 3 --refresh
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from risk.risk_engine import RISK_COLUMNS, compute_risk_scores
+from tools.bar_store import get_bar_store
+from tools.indicators import compute_panel_indicators
+
+DEFAULT_HORIZONS = (5, 20, 60)
+REFRESH_CHUNK = 200
+
+
+def load_panels(tickers: List[str], years: int, interval: str = "1d", refresh: bool = False) -> Dict[str, pd.DataFrame]:
+    """High/Low/Close panels (dates x tickers) for the last `years` years"""
+    if refresh:
+        from tools.price_tool import load_history_batch
+
+        period = f"{years}y" if years in (1, 2, 5, 10) else "max"
+        for i in range(0, len(tickers), REFRESH_CHUNK):
+            load_history_batch(tickers[i:i + REFRESH_CHUNK], period=period, interval=interval)
+
+    start = pd.Timestamp.now(tz="UTC") - pd.DateOffset(years=years)
+    panels = get_bar_store().load_panel(tickers, interval, start=start.normalize())
+    # drop symbols with no stored history at all
+    keep = panels["Close"].columns[panels["Close"].notna().any()]
+    return {name: panel[keep] for name, panel in panels.items()}
+
+
+def daily_risk_scores(panels: Dict[str, pd.DataFrame], fundamentals: Optional[pd.DataFrame] = None,
+                      extra: Optional[Dict[str, pd.DataFrame]] = None) -> pd.DataFrame:
+    """
+    Risk score for every (date, ticker) with a close and warmed-up indicators.
+
+    Args:
+        fundamentals: optional frame indexed by ticker with PE_ratio, EPS, beta
+                      (applied to every date)
+        extra: more panels shaped like Close to carry along as columns
+               (e.g. forward_outcomes)
+
+    Returns:
+        long frame with Date, ticker, the indicator inputs, the extra columns
+        and the compute_risk_scores output columns
+    """
+    close, high, low = panels["Close"], panels["High"], panels["Low"]
+    indicators = compute_panel_indicators(close, high, low)
+
+    columns = {name: indicators[name] for name in ("RSI", "MACD", "EMA10", "EMA50", "ATR")}
+    frame = pd.DataFrame({
+        name: values.to_numpy().ravel() for name, values in columns.items()
+    }, index=pd.MultiIndex.from_product([close.index, close.columns], names=["Date", "ticker"]))
+
+    if fundamentals is not None:
+        for name in ("PE_ratio", "EPS", "beta"):
+            if name in fundamentals:
+                per_ticker = fundamentals[name].reindex(close.columns).to_numpy(dtype=float)
+                frame[name] = np.tile(per_ticker, len(close.index))
+
+    for name, panel in (extra or {}).items():
+        frame[name] = panel.reindex(index=close.index, columns=close.columns).to_numpy().ravel()
+
+    # only score bars where the stock traded and the slowest indicator is warmed up
+    ready = close.notna().to_numpy().ravel() & frame[["RSI", "EMA50", "ATR"]].notna().all(axis=1).to_numpy()
+    frame = frame[ready]
+
+    scores = compute_risk_scores(frame.reindex(columns=[c for c in RISK_COLUMNS if c in frame]))
+    return frame.join(scores).reset_index()
+
+
+def forward_outcomes(close: pd.DataFrame, horizons: Sequence[int] = DEFAULT_HORIZONS) -> Dict[str, pd.DataFrame]:
+    """
+    Per horizon h (in bars): fwd_ret_h = close[t+h] / close[t] - 1 and
+    fwd_dd_h = worst peak-to-trough decline over bars t..t+h (<= 0).
+    Gaps are squeezed out per ticker, so h counts that ticker's own bars.
+    """
+    values = close.to_numpy(dtype=float)
+    T, N = values.shape
+    valid = ~np.isnan(values)
+    order = np.argsort(~valid, axis=0, kind="stable")       # traded bars first, in time order
+    packed = np.take_along_axis(values, order, axis=0)
+    inverse = np.argsort(order, axis=0, kind="stable")
+
+    def unpack(x):
+        x = np.take_along_axis(x, inverse, axis=0)
+        x[~valid] = np.nan
+        return pd.DataFrame(x, index=close.index, columns=close.columns)
+
+    out = {}
+    peak = packed.copy()
+    drawdown = np.zeros((T, N))
+    for k in range(1, max(horizons) + 1):
+        ahead = np.full((T, N), np.nan)
+        ahead[:T - k] = packed[k:]
+        with np.errstate(invalid="ignore"):
+            peak = np.fmax(peak, ahead)
+            drawdown = np.fmin(drawdown, ahead / peak - 1)
+        if k in horizons:
+            with np.errstate(invalid="ignore"):
+                out[f"fwd_ret_{k}"] = unpack(ahead / packed - 1)
+            # a window that runs past the last bar is incomplete
+            out[f"fwd_dd_{k}"] = unpack(np.where(np.isnan(ahead), np.nan, drawdown))
+    return out
+
+
+def summarize(scored: pd.DataFrame, horizons: Sequence[int] = DEFAULT_HORIZONS,
+              by: str = "classification") -> pd.DataFrame:
+    """
+    Forward return / drawdown statistics per horizon and risk class.
+
+    Args:
+        by: "classification", or "risk_score" for one row per score level
+            (finer, and still informative when few rules can fire)
+    """
+    rows = []
+    for h in horizons:
+        df = scored[[by, f"fwd_ret_{h}", f"fwd_dd_{h}"]].dropna()
+        df.columns = [by, "ret", "dd"]
+
+        for key, group in df.groupby(by):
+            rows.append({
+                "horizon": h,
+                by: key,
+                "observations": len(group),
+                "mean_return": group["ret"].mean(),
+                "median_return": group["ret"].median(),
+                "hit_rate": (group["ret"] > 0).mean(),
+                "p05_return": group["ret"].quantile(0.05),
+                "mean_drawdown": group["dd"].mean(),
+                "p05_drawdown": group["dd"].quantile(0.05),
+            })
+
+    result = pd.DataFrame(rows)
+    if result.empty:
+        return result
+    rank = result[by].map({"Low": 0, "Medium": 1, "High": 2}) if by == "classification" else result[by]
+    return result.iloc[np.lexsort([rank, result["horizon"]])].set_index(["horizon", by])
+
+
+def run_backtest(tickers: List[str], years: int = 10, horizons: Sequence[int] = DEFAULT_HORIZONS,
+                 refresh: bool = False, with_fundamentals: bool = False) -> dict:
+    """
+    Returns:
+        {"scores": long per-(date, ticker) frame, "summary": per-class stats,
+         "by_score": the same per risk_score level, "timings": seconds per stage}
+    """
+    timings = {}
+    started = time.perf_counter()
+    panels = load_panels(tickers, years, refresh=refresh)
+    timings["load"] = time.perf_counter() - started
+
+    fundamentals = None
+    if with_fundamentals:
+        from tools.fundamentals_store import get_fundamentals_store
+        table = get_fundamentals_store().load_table()
+        fundamentals = table.rename(columns={"pe": "PE_ratio", "eps": "EPS"})
+
+    started = time.perf_counter()
+    outcomes = forward_outcomes(panels["Close"], horizons)
+    timings["outcomes"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scored = daily_risk_scores(panels, fundamentals, extra=outcomes)
+    timings["score"] = time.perf_counter() - started
+
+    summary = summarize(scored, horizons)
+    by_score = summarize(scored, horizons, by="risk_score")
+
+    return {"scores": scored, "summary": summary, "by_score": by_score, "timings": timings}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest the risk score over stored history")
+    parser.add_argument("--tickers", nargs="*", help="default: the NSE universe")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--horizons", type=int, nargs="+", default=list(DEFAULT_HORIZONS))
+    parser.add_argument("--refresh", action="store_true", help="download missing bars first")
+    parser.add_argument("--with-fundamentals", action="store_true")
+    args = parser.parse_args()
+
+    if args.tickers:
+        tickers = args.tickers
+    else:
+        from tools.universe import load_nse_universe
+        tickers = load_nse_universe()
+
+    result = run_backtest(tickers, args.years, args.horizons, args.refresh, args.with_fundamentals)
+    scores = result["scores"]
+    print(f"{scores['ticker'].nunique()} tickers, {len(scores)} scored bars")
+    print("timings (s):", {k: round(v, 2) for k, v in result["timings"].items()})
+    with pd.option_context("display.float_format", "{:.4f}".format, "display.width", 160):
+        print(result["summary"])
+        print(result["by_score"])
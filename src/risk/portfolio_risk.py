@@ -0,0 +1,179 @@
+# src/risk/portfolio_risk.py
+"""
+Portfolio-level Value at Risk and expected shortfall.
+
+All three methods work on one NumPy matrix of daily log returns (dates x
+positions) built from the local bar store, and report losses in currency
+over `horizon_days` at `confidence`:
+
+    historical   empirical quantile of the portfolio P&L on overlapping
+                 horizon-day windows of real history
+    parametric   delta-normal: mean / covariance of simple returns, scaled
+                 by the horizon, closed-form normal quantile and ES
+    monte_carlo  multivariate Student-t log-returns (fat tails) with the
+                 historical covariance, revalued per position; paths are
+                 split into fixed-size chunks, each seeded from
+                 SeedSequence(seed).spawn(), and spread over a process pool,
+                 so results depend on the seed only, not on the worker count
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+VAR_CONFIDENCE = 0.95
+HISTORY_PERIOD = "1y"
+MC_PATHS = int(os.getenv("MC_PATHS", "100000"))
+MC_CHUNK = 10_000            # paths per task (fixed, so seeding is worker-independent)
+MC_DF = 5                    # Student-t degrees of freedom
+MC_SEED = 42
+MC_WORKERS = int(os.getenv("MC_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# --------------------------------------------------
+# RETURNS
+# --------------------------------------------------
+def returns_matrix(tickers: List[str], period: str = HISTORY_PERIOD) -> pd.DataFrame:
+    """Daily log returns (dates x tickers) from cached bars, on dates where every ticker traded"""
+    from tools.price_tool import load_history_batch
+
+    frames = load_history_batch(tickers, period=period)
+    missing = [t for t in tickers if frames.get(t) is None or frames[t].empty]
+    if missing:
+        raise ValueError(f"No price history for {', '.join(missing)}")
+
+    closes = pd.concat({t: frames[t]["Close"] for t in tickers}, axis=1)
+    closes.index = closes.index.normalize()
+    closes = closes[~closes.index.duplicated(keep="last")].ffill(limit=3)
+    return np.log(closes).diff().dropna(how="any")
+
+
+def _loss_stats(pnl: np.ndarray, confidence: float) -> Dict[str, float]:
+    """VaR / ES as positive losses from a P&L sample"""
+    var = -np.quantile(pnl, 1 - confidence)
+    tail = pnl[pnl <= -var]
+    return {"var": float(var), "es": float(-tail.mean()) if len(tail) else float(var)}
+
+
+# --------------------------------------------------
+# METHODS
+# --------------------------------------------------
+def historical_var(log_returns: np.ndarray, values: np.ndarray, confidence: float = VAR_CONFIDENCE,
+                   horizon_days: int = 1) -> Dict[str, float]:
+    window = np.cumsum(log_returns, axis=0)
+    window = np.vstack([np.zeros(log_returns.shape[1]), window])
+    horizon = window[horizon_days:] - window[:-horizon_days]      # overlapping h-day log returns
+    pnl = np.expm1(horizon) @ values
+    return _loss_stats(pnl, confidence)
+
+
+def parametric_var(log_returns: np.ndarray, values: np.ndarray, confidence: float = VAR_CONFIDENCE,
+                   horizon_days: int = 1) -> Dict[str, float]:
+    simple = np.expm1(log_returns)
+    mu = simple.mean(axis=0) @ values * horizon_days
+    sigma = float(np.sqrt(values @ np.cov(simple, rowvar=False, ddof=1).reshape(len(values), -1) @ values * horizon_days))
+
+    normal = NormalDist()
+    z = normal.inv_cdf(1 - confidence)
+    return {
+        "var": float(-(mu + z * sigma)),
+        "es": float(-(mu - sigma * normal.pdf(z) / (1 - confidence))),
+    }
+
+
+def _mc_chunk(mu: np.ndarray, chol: np.ndarray, values: np.ndarray, df: int, n: int, seed) -> np.ndarray:
+    """P&L of `n` simulated paths (runs in a pool worker)"""
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((n, len(mu))) @ chol.T
+    # multivariate t with covariance chol @ chol.T: scale the normal draw by sqrt((df - 2) / chi2)
+    scale = np.sqrt((df - 2) / rng.chisquare(df, size=(n, 1)))
+    return np.expm1(mu + z * scale) @ values
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                import multiprocessing as mp
+                _pool = ProcessPoolExecutor(max_workers=MC_WORKERS, mp_context=mp.get_context("spawn"))
+
+    return _pool
+
+
+def monte_carlo_var(log_returns: np.ndarray, values: np.ndarray, confidence: float = VAR_CONFIDENCE,
+                    horizon_days: int = 1, paths: int = MC_PATHS, seed: int = MC_SEED,
+                    df: int = MC_DF) -> Dict[str, float]:
+    n_assets = log_returns.shape[1]
+    mu = log_returns.mean(axis=0) * horizon_days
+    cov = np.cov(log_returns, rowvar=False, ddof=1).reshape(n_assets, n_assets) * horizon_days
+    # jitter keeps the factorization alive for collinear / short histories
+    chol = np.linalg.cholesky(cov + np.eye(n_assets) * 1e-12 * max(np.trace(cov), 1e-12))
+
+    sizes = [min(MC_CHUNK, paths - i) for i in range(0, paths, MC_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(mu, chol, values, df, n, s) for n, s in zip(sizes, seeds)]
+
+    if len(args) == 1 or MC_WORKERS <= 1:
+        parts = [_mc_chunk(*a) for a in args]
+    else:
+        pool = _get_pool()
+        parts = [f.result() for f in [pool.submit(_mc_chunk, *a) for a in args]]
+
+    result = _loss_stats(np.concatenate(parts), confidence)
+    result["paths"] = paths
+    return result
+
+
+# --------------------------------------------------
+# PORTFOLIO
+# --------------------------------------------------
+def portfolio_risk(position_values: Dict[str, float], confidence: float = VAR_CONFIDENCE,
+                   horizon_days: int = 1, period: str = HISTORY_PERIOD,
+                   paths: int = MC_PATHS, seed: int = MC_SEED) -> dict:
+    """
+    VaR / ES of a portfolio by all three methods.
+
+    Args:
+        position_values: {ticker: current value}; several positions in one
+                         ticker should be summed by the caller
+
+    Returns:
+        {"confidence", "horizon_days", "observations", "total_value",
+         "historical" / "parametric" / "monte_carlo": {"var", "es",
+         "var_pct", "es_pct"}} with losses as positive currency amounts
+    """
+    tickers = list(position_values)
+    values = np.array([position_values[t] for t in tickers], dtype=float)
+    total = float(values.sum())
+
+    returns = returns_matrix(tickers, period=period)
+    if len(returns) < max(30, horizon_days + 1):
+        raise ValueError(f"Only {len(returns)} common trading days of history")
+    r = returns.to_numpy()
+
+    result = {
+        "confidence": confidence,
+        "horizon_days": horizon_days,
+        "observations": len(r),
+        "total_value": round(total, 2),
+        "historical": historical_var(r, values, confidence, horizon_days),
+        "parametric": parametric_var(r, values, confidence, horizon_days),
+        "monte_carlo": monte_carlo_var(r, values, confidence, horizon_days, paths=paths, seed=seed),
+    }
+    for method in ("historical", "parametric", "monte_carlo"):
+        m = result[method]
+        m["var_pct"] = round(m["var"] / total * 100, 2) if total else 0.0
+        m["es_pct"] = round(m["es"] / total * 100, 2) if total else 0.0
+        m["var"] = round(m["var"], 2)
+        m["es"] = round(m["es"], 2)
+    return result
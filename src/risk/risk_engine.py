@@ -1,13 +1,15 @@
 import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from risk.risk_rules import CompiledRules, get_rules
+from utils.diagnostics import diag
 
 def compute_risk_score(context: dict):
     """
     context: dictionary from planner (price_data, fundamentals, sentiment, etc.)
     Returns: dict with risk_score, confidence, classification, reasons
     """
-    risk_score = 0.0
-    reasons = []
-
     # Extract safely
     price = context.get("price_data", {})
     fund = context.get("fundamentals", {})
@@ -15,91 +17,185 @@ def compute_risk_score(context: dict):
     beta = fund.get("beta", 1.0)
     sentiment_val = sent.get("sentiment", 0.0)
 
-    # --- Technical Risk (max 0.4)
-    if price.get("RSI", 0) > 70:
-        risk_score += 0.15
-        reasons.append("RSI > 70 (overbought)")
-    if price.get("MACD", 0) < 0:
-        risk_score += 0.10
-        reasons.append("MACD < 0 (bearish)")
-    if price.get("EMA10", 0) < price.get("EMA50", 0):
-        risk_score += 0.10
-        reasons.append("EMA10 < EMA50 (short-term weakness)")
-    if price.get("ATR", 0) > 5:  # arbitrary volatility threshold
-        risk_score += 0.05
-        reasons.append("ATR high (volatility warning)")
-
-    # --- Sentiment Risk (max 0.3)
-    if sentiment_val < 0:
-        risk_score += 0.15
-        reasons.append("Negative market/news sentiment")
-    if any(a["sentiment"] == "NEGATIVE" for a in sent.get("articles", [])):
-        risk_score += 0.15
-        reasons.append("Recent negative headlines")
-
-    # --- Fundamental Risk (max 0.2)
-    pe = fund.get("PE_ratio")
-    eps = fund.get("EPS")
-    if pe and pe > 30:
-        risk_score += 0.10
-        reasons.append(f"PE ratio high ({pe:.1f})")
-    if eps and eps < 0:
-        risk_score += 0.10
-        reasons.append("Negative EPS (loss-making)")
-
-    # --- Market correlation / Beta (max 0.1)
-    if beta and beta > 1.2:
-        risk_score += 0.05
-        reasons.append(f"High beta ({beta:.2f}) — sensitive to market moves")
-
-    # clamp
-    risk_score = min(risk_score, 1.0)
-
-    # --- Confidence (based on volatility)
-    avg_return = abs(price.get("EMA10", 0) - price.get("EMA50", 0))
-    std_dev = price.get("ATR", 1)
-    confidence = 1 - min(std_dev / (avg_return + 1e-5), 1.0)
-    confidence = round(max(0.0, min(confidence, 1.0)), 2)
-
-    # --- Risk classification
-    if risk_score < 0.4:
-        risk_class = "Low"
-    elif risk_score <= 0.7:
-        risk_class = "Medium"
-    else:
-        risk_class = "High"
-        # -----------------------
-    # DEBUG PRINT (no logic change)
-    # -----------------------
-    print("\n===== RISK SCORE INPUTS =====")
-
-    print("\n--- PRICE DATA ---")
-    print(f"RSI: {price.get('RSI')}")
-    print(f"MACD: {price.get('MACD')}")
-    print(f"EMA10: {price.get('EMA10')}")
-    print(f"EMA50: {price.get('EMA50')}")
-    print(f"ATR: {price.get('ATR')}")
-
-    print("\n--- FUNDAMENTALS ---")
-    print(f"Beta: {beta}")
-    print(f"PE Ratio: {fund.get('PE_ratio')}")
-    print(f"EPS: {fund.get('EPS')}")
-
-    print("\n--- SENTIMENT ---")
-    print(f"Sentiment Score: {sentiment_val}")
-    print(f"Articles: {len(sent.get('articles', []))}")
-
-    print("\n--- OUTPUT ---")
-    print(f"Risk Score: {round(risk_score, 2)}")
-    print(f"Confidence: {confidence}")
-    print(f"Classification: {risk_class}")
-    print(f"Reasons: {reasons}")
-
-    print("==============================\n")
+    # Same compiled rule table as the batch path, evaluated on plain floats
+    rules = get_rules()
+    values = context_values(context)
+    score, mask = rules.evaluate(values)
+    risk_score = round(score, 2)
+    confidence = round(_confidence(values["EMA10"], values["EMA50"], values["ATR"]), 2)
+    risk_class = rules.classify_one(score)
+    reasons = rules.decode(mask, values)
 
-    return {
-        "risk_score": round(risk_score, 2),
+    diag("risk.score", lambda: {
+        "ticker": context.get("ticker"),
+        "inputs": {
+            "RSI": price.get("RSI"),
+            "MACD": price.get("MACD"),
+            "EMA10": price.get("EMA10"),
+            "EMA50": price.get("EMA50"),
+            "ATR": price.get("ATR"),
+            "beta": beta,
+            "PE_ratio": fund.get("PE_ratio"),
+            "EPS": fund.get("EPS"),
+            "sentiment": sentiment_val,
+            "articles": len(sent.get("articles", [])),
+        },
+        "risk_score": risk_score,
+        "confidence": confidence,
+        "classification": risk_class,
+        "reasons": reasons,
+    })
+
+    result = {
+        "risk_score": risk_score,
         "confidence": confidence,
         "classification": risk_class,
         "reasons": reasons
     }
+    # inputs the planner had to fill with defaults (failed / timed-out tools)
+    if context.get("tool_errors"):
+        result["degraded"] = sorted(context["tool_errors"])
+    return result
+
+
+# ==================================================
+# BATCH SCORING
+# ==================================================
+# Input columns and the value compute_risk_score assumes when a key is missing
+# (ATR: 1 for confidence; the ATR > 5 check is False for 0 and 1 alike)
+RISK_COLUMNS = {
+    "RSI": 0.0,
+    "MACD": 0.0,
+    "EMA10": 0.0,
+    "EMA50": 0.0,
+    "ATR": 1.0,
+    "sentiment": 0.0,
+    "negative_headlines": False,
+    "PE_ratio": np.nan,
+    "EPS": np.nan,
+    "beta": 1.0,
+}
+
+
+def _value(d: dict, key: str, default):
+    value = d.get(key, default)
+    return np.nan if value is None else value
+
+
+def context_values(ctx: dict) -> Dict[str, float]:
+    """RISK_COLUMNS values of one planner context as floats (None -> NaN, which fails every check)"""
+    price = ctx.get("price_data") or {}
+    fund = ctx.get("fundamentals") or {}
+    sent = ctx.get("sentiment") or {}
+    return {
+        "RSI": float(_value(price, "RSI", 0.0)),
+        "MACD": float(_value(price, "MACD", 0.0)),
+        "EMA10": float(_value(price, "EMA10", 0.0)),
+        "EMA50": float(_value(price, "EMA50", 0.0)),
+        "ATR": float(_value(price, "ATR", 1.0)),
+        "sentiment": float(_value(sent, "sentiment", 0.0)),
+        "negative_headlines": float(any(a["sentiment"] == "NEGATIVE" for a in sent.get("articles", []))),
+        "PE_ratio": float(_value(fund, "PE_ratio", np.nan)),
+        "EPS": float(_value(fund, "EPS", np.nan)),
+        "beta": float(_value(fund, "beta", 1.0)),
+    }
+
+
+def contexts_to_frame(contexts: List[dict], index=None) -> pd.DataFrame:
+    """
+    Columnar form of planner contexts (one row per context, RISK_COLUMNS columns)
+    for compute_risk_scores.
+    """
+    return pd.DataFrame([context_values(ctx) for ctx in contexts], index=index,
+                        columns=list(RISK_COLUMNS), dtype=float)
+
+
+def _confidence(ema10: float, ema50: float, atr: float) -> float:
+    """Scalar twin of the confidence column in compute_risk_scores (NaN -> 0.0)"""
+    ratio = atr / (abs(ema10 - ema50) + 1e-5)
+    confidence = 1 - (1.0 if ratio > 1.0 else ratio)
+    confidence = 1.0 if confidence > 1.0 else confidence
+    return confidence if confidence > 0.0 else 0.0
+
+
+def _py_round(values: np.ndarray, digits: int = 2) -> np.ndarray:
+    """Python round() per element (np.round differs on some halfway cases)"""
+    return np.fromiter((round(float(v), digits) for v in values), dtype=float, count=len(values))
+
+
+def compute_risk_scores(frame: pd.DataFrame, rules: Optional[CompiledRules] = None) -> pd.DataFrame:
+    """
+    Vectorized compute_risk_score for N tickers.
+
+    Args:
+        frame: one row per ticker with RISK_COLUMNS columns (missing columns
+               take the scalar defaults), e.g. from contexts_to_frame
+        rules: compiled rule table (default: the hot-reloaded risk_rules.json)
+
+    Returns:
+        DataFrame on frame's index with risk_score, confidence, classification
+        and reasons (bitmask, bit i = rule i, see decode_reasons)
+    """
+    rules = rules or get_rules()
+    n = len(frame)
+
+    def col(name):
+        if name in frame:
+            return frame[name].to_numpy(dtype=float)
+        return np.full(n, float(RISK_COLUMNS[name]))
+
+    # weights are added in rule order, so float sums are reproducible bit for bit
+    risk_score = np.zeros(n)
+    reasons = np.zeros(n, dtype=np.int64)
+    for rule, mask in zip(rules.rules, rules.masks(col)):
+        risk_score = risk_score + np.where(mask, rule.weight, 0.0)
+        reasons |= np.where(mask, rule.bit, 0)
+    risk_score = np.where(risk_score > rules.max_score, rules.max_score, risk_score)
+
+    # confidence (based on volatility), with Python min/max semantics (NaN ATR or EMAs -> 0.0)
+    ema10, ema50, atr = col("EMA10"), col("EMA50"), col("ATR")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = atr / (np.abs(ema10 - ema50) + 1e-5)
+        confidence = 1 - np.where(ratio > 1.0, 1.0, ratio)
+        confidence = np.where(confidence > 1.0, 1.0, confidence)
+        confidence = np.where(confidence > 0.0, confidence, 0.0)
+
+    # few distinct scores: round each once
+    unique, inverse = np.unique(risk_score, return_inverse=True)
+
+    return pd.DataFrame({
+        "risk_score": _py_round(unique)[inverse],
+        "confidence": _py_round(confidence),
+        "classification": rules.classify(risk_score),
+        "reasons": reasons,
+    }, index=frame.index)
+
+
+def decode_reasons(mask: int, values: Dict, rules: Optional[CompiledRules] = None) -> List[str]:
+    """Reason strings for a bitmask from compute_risk_scores; `values` is the row's input columns"""
+    return (rules or get_rules()).decode(mask, values)
+
+
+def score_contexts(contexts: List[dict]) -> List[Dict]:
+    """compute_risk_score for many contexts in one vectorized pass (same result dicts, same order)"""
+    if not contexts:
+        return []
+
+    rules = get_rules()
+    frame = contexts_to_frame(contexts)
+    scores = compute_risk_scores(frame, rules)
+    diag("risk.batch", lambda: {
+        "rows": len(frame),
+        "rules_version": rules.version,
+        "classes": scores["classification"].value_counts().to_dict(),
+        "scores": dict(zip([c.get("ticker") for c in contexts], scores["risk_score"].tolist())),
+    })
+    return [
+        {
+            "risk_score": float(row.risk_score),
+            "confidence": float(row.confidence),
+            "classification": row.classification,
+            "reasons": decode_reasons(row.reasons, values, rules),
+        }
+        for row, values in zip(scores.itertuples(), frame.to_dict("records"))
+    ]
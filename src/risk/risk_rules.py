@@ -0,0 +1,235 @@
+# src/risk/risk_rules.py
+"""
+Declarative risk rule table.
+
+Thresholds, weights, reason texts and class cut-offs live in
+risk/risk_rules.json (or RISK_RULES_PATH). The table is compiled once into
+vectorized predicates shared by compute_risk_score and
+compute_risk_scores, and recompiled whenever the file's mtime changes, so
+an edit takes effect on the next score without a restart. A broken edit
+is reported and the last good table stays in use.
+
+Rule fields:
+    flag     name of the reasons bit (bit i = rule i)
+    column   input column (see risk_engine.RISK_COLUMNS)
+    op       one of >, >=, <, <=, truthy
+    value    threshold, or
+    other    column to compare against instead
+    weight   added to the score when the predicate holds
+    reason   text for the reasons list; may use {column} placeholders
+
+Re-score the universe after an edit (from src/):
+    python -m risk.risk_rules --rescore
+"""
+
+import argparse
+import json
+import operator
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils.diagnostics import diag
+
+RISK_RULES_PATH = os.getenv(
+    "RISK_RULES_PATH",
+    os.path.join(os.path.dirname(__file__), "risk_rules.json")
+)
+
+OPS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+class Rule:
+    __slots__ = ("flag", "bit", "weight", "reason", "columns", "predicate")
+
+    def __init__(self, flag: str, bit: int, weight: float, reason: str,
+                 columns: tuple, predicate: Callable):
+        self.flag = flag
+        self.bit = bit
+        self.weight = weight
+        self.reason = reason
+        self.columns = columns
+        self.predicate = predicate
+
+
+class CompiledRules:
+    """A rule table ready to evaluate against column arrays"""
+
+    def __init__(self, rules: List[Rule], max_score: float, classes: List[tuple],
+                 default_class: str, version: Optional[float] = None):
+        self.rules = rules
+        self.max_score = max_score
+        self.classes = classes
+        self.default_class = default_class
+        self.version = version
+        self.bits = {rule.flag: rule.bit for rule in rules}
+
+    @property
+    def columns(self) -> set:
+        return {c for rule in self.rules for c in rule.columns}
+
+    def masks(self, col: Callable[[str], np.ndarray]) -> List[np.ndarray]:
+        """One boolean array per rule; col(name) returns an input column"""
+        with np.errstate(invalid="ignore"):
+            return [rule.predicate(col) for rule in self.rules]
+
+    def evaluate(self, values: Dict) -> tuple:
+        """(capped score, reasons bitmask) for one row of plain float values"""
+        score, mask = 0.0, 0
+        col = values.__getitem__
+        for rule in self.rules:
+            if rule.predicate(col):
+                score += rule.weight
+                mask |= rule.bit
+        return (self.max_score if score > self.max_score else score), mask
+
+    def classify_one(self, score: float) -> str:
+        for label, op, value in self.classes:
+            if op(score, value):
+                return label
+        return self.default_class
+
+    def classify(self, scores: np.ndarray) -> np.ndarray:
+        return np.select(
+            [op(scores, value) for _, op, value in self.classes],
+            [label for label, _, _ in self.classes],
+            default=self.default_class,
+        )
+
+    def decode(self, mask: int, values: Dict) -> List[str]:
+        """Reason strings for a reasons bitmask; `values` fills the {column} placeholders"""
+        return [
+            rule.reason.format(**values)
+            for rule in self.rules
+            if int(mask) & rule.bit
+        ]
+
+
+def _predicate(spec: dict) -> tuple:
+    column, op = spec["column"], spec["op"]
+    if op == "truthy":
+        return (column,), lambda col: col(column) != 0
+    if op not in OPS:
+        raise ValueError(f"Rule {spec['flag']}: unknown op '{op}'")
+
+    compare = OPS[op]
+    if "other" in spec:
+        other = spec["other"]
+        return (column, other), lambda col: compare(col(column), col(other))
+    value = float(spec["value"])
+    return (column,), lambda col: compare(col(column), value)
+
+
+def compile_rules(config: dict, version: Optional[float] = None) -> CompiledRules:
+    """Validate a rule table (parsed JSON) and build its predicates"""
+    from risk.risk_engine import RISK_COLUMNS
+
+    rules = []
+    for i, spec in enumerate(config["rules"]):
+        columns, predicate = _predicate(spec)
+        unknown = [c for c in columns if c not in RISK_COLUMNS]
+        if unknown:
+            raise ValueError(f"Rule {spec['flag']}: unknown column(s) {unknown}")
+        rules.append(Rule(
+            flag=spec["flag"],
+            bit=1 << i,
+            weight=float(spec["weight"]),
+            reason=spec["reason"],
+            columns=columns,
+            predicate=predicate,
+        ))
+    if len({r.flag for r in rules}) != len(rules):
+        raise ValueError("Rule flags must be unique")
+    if len(rules) > 63:
+        raise ValueError("At most 63 rules fit in the reasons bitmask")
+
+    classes = []
+    for spec in config["classes"]:
+        if spec["op"] not in OPS:
+            raise ValueError(f"Class {spec['label']}: unknown op '{spec['op']}'")
+        classes.append((spec["label"], OPS[spec["op"]], float(spec["value"])))
+
+    return CompiledRules(
+        rules,
+        max_score=float(config.get("max_score", 1.0)),
+        classes=classes,
+        default_class=config["default_class"],
+        version=version,
+    )
+
+
+def load_rules(path: str = RISK_RULES_PATH) -> CompiledRules:
+    version = os.stat(path).st_mtime
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_rules(json.load(f), version=version)
+
+
+# Hot-reloaded accessor
+_rules = None
+_rules_lock = threading.Lock()
+
+def get_rules(path: str = RISK_RULES_PATH) -> CompiledRules:
+    """Compiled rules, recompiled when the file changes (one stat() per call)"""
+    global _rules
+
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        mtime = None
+
+    if _rules is None or (mtime is not None and mtime != _rules.version):
+        with _rules_lock:
+            if _rules is None or (mtime is not None and mtime != _rules.version):
+                try:
+                    _rules = load_rules(path)
+                except Exception as e:
+                    if _rules is None:
+                        raise
+                    err = str(e)
+                    diag("risk.rules_reload_failed", lambda: {
+                        "path": path, "error": err, "kept_version": _rules.version,
+                    }, level="WARNING")
+                    _rules.version = mtime
+
+    return _rules
+
+
+def rescore_universe(period: str = "6mo"):
+    """Score every NSE symbol with the current rules (price bar store + fundamentals table)"""
+    import pandas as pd
+
+    from risk.risk_engine import compute_risk_scores
+    from tools.beta_tool import compute_betas
+    from tools.fundamentals_store import get_fundamentals_store
+    from tools.price_tool import get_price_data_batch
+    from tools.universe import load_nse_universe
+
+    prices = pd.DataFrame.from_dict(get_price_data_batch(load_nse_universe(), period=period), orient="index")
+    fundamentals = get_fundamentals_store().load_table().reindex(prices.index)
+
+    frame = prices.reindex(columns=["RSI", "MACD", "EMA10", "EMA50", "ATR"])
+    frame["PE_ratio"] = fundamentals.get("pe")
+    frame["EPS"] = fundamentals.get("eps")
+    # local betas for the whole universe in one pass, .info beta where there is too little history
+    local_beta = compute_betas(list(prices.index), refresh=False)["beta"]
+    frame["beta"] = local_beta.fillna(fundamentals["beta"]) if "beta" in fundamentals else local_beta
+    return compute_risk_scores(frame)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate the risk rule table and optionally re-score the universe")
+    parser.add_argument("--rescore", action="store_true")
+    args = parser.parse_args()
+
+    rules = load_rules()
+    print(f"{len(rules.rules)} rules OK ({RISK_RULES_PATH})")
+    if args.rescore:
+        scores = rescore_universe()
+        print(scores["classification"].value_counts().to_string())
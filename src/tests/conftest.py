@@ -0,0 +1,6 @@
+# src/tests/conftest.py
+# Modules import each other from src/ (e.g. `from tools.social_store import ...`)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,186 @@
+# src/tests/test_social_ingestion.py
+"""
+Incremental social ingestion against recorded fixtures (no network).
+
+Run (from the repo root):
+    python -m pytest src/tests/test_social_ingestion.py -q
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from tools.social_fixtures import fixture_clients
+from tools import social_ingestor
+from tools.social_ingestor import SOCIAL_WINDOW_SECONDS, SocialIngestor
+from tools.social_store import SocialStore
+
+STOCK = "Infosys"
+
+
+def _tweet(i: int, age: float) -> dict:
+    created = datetime.fromtimestamp(time.time() - age, tz=timezone.utc)
+    return {"id": str(1000 + i), "text": f"Infosys tweet {i}", "created_at": created.isoformat()}
+
+def _post(i: int, age: float) -> dict:
+    return {
+        "fullname": f"t3_{i}", "title": f"Infosys post {i}", "selftext": "body",
+        "url": f"https://reddit.com/{i}", "subreddit": "stocks", "created_utc": time.time() - age,
+    }
+
+
+@pytest.fixture
+def clients(tmp_path):
+    """Fixture clients with 3 tweets and 3 posts, newest has the highest number"""
+    path = tmp_path / "fixtures.json"
+    path.write_text(json.dumps({
+        "twitter": {STOCK: [_tweet(i, 600 - i * 100) for i in range(3)]},
+        "reddit": {STOCK: [_post(i, 600 - i * 100) for i in range(3)]},
+    }))
+    return fixture_clients(str(path))
+
+@pytest.fixture
+def ingestor(tmp_path, clients):
+    return SocialIngestor(store=SocialStore(str(tmp_path / "social.sqlite")), clients=clients)
+
+
+# --------------------------------------------------
+# CURSORS
+# --------------------------------------------------
+def test_first_poll_stores_posts_and_cursors(ingestor):
+    assert ingestor.poll(STOCK, timeout=5) == {"reddit": "ok", "twitter": "ok"}
+
+    assert ingestor.store.get_cursor(STOCK, "twitter")["cursor"] == "1002"
+    assert ingestor.store.get_cursor(STOCK, "reddit")["cursor"] == "t3_2"
+
+def test_second_poll_sends_cursors_and_pulls_only_new_items(ingestor, clients):
+    ingestor.poll(STOCK, timeout=5)
+    clients["twitter"].tweets[STOCK].append(_tweet(3, 10))
+    clients["reddit"].posts[STOCK].append(_post(3, 10))
+
+    assert ingestor.poll_source(STOCK, "twitter") == 1
+    assert ingestor.poll_source(STOCK, "reddit") == 1
+
+    assert clients["twitter"].calls[0]["since_id"] is None
+    assert clients["twitter"].calls[-1]["since_id"] == "1002"
+    assert clients["reddit"].calls[0]["before"] is None
+    assert clients["reddit"].calls[-1]["before"] == "t3_2"
+
+    assert ingestor.store.get_cursor(STOCK, "twitter")["cursor"] == "1003"
+    assert ingestor.store.get_cursor(STOCK, "reddit")["cursor"] == "t3_3"
+
+def test_empty_poll_keeps_cursor(ingestor, clients):
+    ingestor.poll(STOCK, timeout=5)
+
+    assert ingestor.poll_source(STOCK, "twitter") == 0
+    assert ingestor.poll_source(STOCK, "reddit") == 0
+    assert ingestor.store.get_cursor(STOCK, "twitter")["cursor"] == "1002"
+    assert ingestor.store.get_cursor(STOCK, "reddit")["cursor"] == "t3_2"
+
+def test_cursor_older_than_search_window_is_dropped(ingestor, clients):
+    ingestor.poll(STOCK, timeout=5)
+    with ingestor.store._lock, ingestor.store._conn:
+        ingestor.store._conn.execute(
+            "UPDATE social_cursors SET last_poll = ?", (time.time() - SOCIAL_WINDOW_SECONDS,)
+        )
+
+    ingestor.poll_source(STOCK, "twitter")
+    assert clients["twitter"].calls[-1]["since_id"] is None
+
+def test_busy_ticker_pages_back_to_the_cursor(ingestor, clients):
+    ingestor.poll(STOCK, timeout=5)
+    clients["twitter"].tweets[STOCK] += [_tweet(i, 300 - i) for i in range(3, 153)]
+    clients["reddit"].posts[STOCK] += [_post(i, 300 - i) for i in range(3, 63)]
+
+    assert ingestor.poll_source(STOCK, "twitter") == 150
+    assert ingestor.poll_source(STOCK, "reddit") == 60
+
+    assert [c["pagination_token"] for c in clients["twitter"].calls[1:]] == [None, "100"]
+    assert [c["before"] for c in clients["reddit"].calls[1:]] == ["t3_2", "t3_27", "t3_52"]
+    assert ingestor.store.get_cursor(STOCK, "twitter")["cursor"] == "1152"
+    assert ingestor.store.get_cursor(STOCK, "reddit")["cursor"] == "t3_62"
+
+def test_reddit_page_cap_leaves_the_rest_for_the_next_poll(ingestor, clients, monkeypatch):
+    ingestor.poll(STOCK, timeout=5)
+    clients["reddit"].posts[STOCK] += [_post(i, 300 - i) for i in range(3, 63)]
+    monkeypatch.setattr(social_ingestor, "SOCIAL_MAX_PAGES", 1)
+
+    assert ingestor.poll_source(STOCK, "reddit") == 25
+    assert ingestor.poll_source(STOCK, "reddit") == 25
+    assert ingestor.poll_source(STOCK, "reddit") == 10
+    assert len(ingestor.store.recent(STOCK, "reddit", max_age=SOCIAL_WINDOW_SECONDS, limit=100)) == 63
+
+def test_deleted_reddit_cursor_falls_back_to_newest_stored_time(ingestor, clients):
+    ingestor.poll(STOCK, timeout=5)
+    clients["reddit"].posts[STOCK] = [p for p in clients["reddit"].posts[STOCK] if p["fullname"] != "t3_2"]
+    clients["reddit"].posts[STOCK].append(_post(3, 10))
+
+    assert ingestor.poll_source(STOCK, "reddit") == 1
+    assert clients["reddit"].calls[-1]["before"] is None
+    assert ingestor.store.get_cursor(STOCK, "reddit")["cursor"] == "t3_3"
+
+    assert ingestor.poll_source(STOCK, "reddit") == 0
+
+
+# --------------------------------------------------
+# STATUS FLAGS
+# --------------------------------------------------
+def test_recent_poll_is_fresh(ingestor, clients):
+    ingestor.poll(STOCK, timeout=5)
+
+    assert ingestor.poll(STOCK, timeout=5, max_age=300) == {"reddit": "fresh", "twitter": "fresh"}
+    assert len(clients["twitter"].calls) == 1
+
+def test_missing_client_is_no_credentials(tmp_path, clients):
+    ingestor = SocialIngestor(store=SocialStore(str(tmp_path / "social.sqlite")),
+                              clients={"reddit": clients["reddit"]})
+
+    assert ingestor.poll(STOCK, timeout=5) == {"reddit": "ok", "twitter": "no_credentials"}
+
+def test_failing_source_is_error(ingestor, clients):
+    def fail(**kwargs):
+        raise RuntimeError("rate limited")
+    clients["twitter"].search_recent_tweets = fail
+
+    assert ingestor.poll(STOCK, timeout=5) == {"reddit": "ok", "twitter": "error"}
+    assert ingestor.store.get_cursor(STOCK, "twitter") is None
+
+def test_slow_source_is_timeout(ingestor, clients):
+    search = clients["twitter"].search_recent_tweets
+    def slow(**kwargs):
+        time.sleep(0.5)
+        return search(**kwargs)
+    clients["twitter"].search_recent_tweets = slow
+
+    assert ingestor.poll(STOCK, timeout=0.1)["twitter"] == "timeout"
+
+
+# --------------------------------------------------
+# STORE READ PATH
+# --------------------------------------------------
+def test_recent_reads_newest_first(ingestor):
+    ingestor.poll(STOCK, timeout=5)
+
+    posts = ingestor.store.recent(STOCK, "reddit", max_age=SOCIAL_WINDOW_SECONDS, limit=2)
+    assert [p["post_id"] for p in posts] == ["t3_2", "t3_1"]
+    assert posts[0]["community"] == "r/stocks"
+    assert ingestor.store.recent(STOCK, "reddit", max_age=550, limit=10)[-1]["post_id"] == "t3_1"
+
+def test_stock_names_share_one_key(ingestor):
+    ingestor.poll(STOCK, timeout=5)
+
+    assert len(ingestor.store.recent(STOCK.upper(), "twitter", max_age=SOCIAL_WINDOW_SECONDS, limit=10)) == 3
+
+def test_get_social_news_answers_from_store(ingestor, monkeypatch):
+    pytest.importorskip("dotenv")
+    from tools import social_news_tool
+
+    monkeypatch.setattr(social_news_tool, "get_social_ingestor", lambda: ingestor)
+    monkeypatch.setattr(social_news_tool, "SOCIAL_BACKGROUND_POLL", False)
+
+    news = social_news_tool.get_social_news(STOCK, timeout=5)
+    assert news["sources"] == {"reddit": "ok", "twitter": "ok"}
+    assert [p["source"] for p in news["posts"]] == ["Reddit"] * 3 + ["Twitter"] * 3
+    assert ingestor.store.tracked(60) == [STOCK.lower()]
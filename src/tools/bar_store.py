@@ -0,0 +1,271 @@
+# src/tools/bar_store.py
+"""
+Local on-disk OHLCV store (SQLite), keyed by ticker and interval.
+
+get_price_data reads from here first and only asks yfinance for the
+bars newer than the last stored timestamp.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+BAR_STORE_PATH = os.getenv(
+    "BAR_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "stock_cache", "bars.sqlite")
+)
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    dividends REAL, splits REAL,
+    PRIMARY KEY (ticker, interval, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS bar_meta (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    tz TEXT,
+    covered_from INTEGER,
+    last_fetch REAL,
+    PRIMARY KEY (ticker, interval)
+);
+
+CREATE TABLE IF NOT EXISTS indicator_state (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (ticker, interval)
+);
+"""
+
+
+def to_epoch(index: pd.DatetimeIndex) -> list:
+    """Epoch seconds for a (possibly tz-naive) DatetimeIndex"""
+    if len(index) == 0:
+        return []
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return ((index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).tolist()
+
+
+class BarStore:
+    def __init__(self, path: str = BAR_STORE_PATH):
+        """
+        Args:
+            path: SQLite file to keep the bars in (created on first use)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # --------------------------------------------------
+    # METADATA
+    # --------------------------------------------------
+    def get_meta(self, ticker: str, interval: str) -> Optional[dict]:
+        """Returns {tz, covered_from, last_fetch, last_ts} or None if nothing stored"""
+        with self._lock:
+            meta = self._conn.execute(
+                "SELECT tz, covered_from, last_fetch FROM bar_meta WHERE ticker=? AND interval=?",
+                (ticker, interval)
+            ).fetchone()
+            if meta is None:
+                return None
+            last_ts = self._conn.execute(
+                "SELECT MAX(ts) FROM bars WHERE ticker=? AND interval=?",
+                (ticker, interval)
+            ).fetchone()[0]
+
+        return {
+            "tz": meta[0],
+            "covered_from": meta[1],
+            "last_fetch": meta[2],
+            "last_ts": last_ts
+        }
+
+    def tickers(self, interval: str) -> List[str]:
+        """Every ticker with stored bars for `interval`"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticker FROM bar_meta WHERE interval=? ORDER BY ticker", (interval,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def fetch_times(self, interval: str) -> Dict[str, float]:
+        """{ticker: wall time of its last upsert} for `interval`"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ticker, last_fetch FROM bar_meta WHERE interval=?", (interval,)
+            ).fetchall()
+        return {ticker: last_fetch or 0.0 for ticker, last_fetch in rows}
+
+    def last_write(self, interval: str) -> float:
+        """Wall time of the most recent upsert for `interval` (0 if none)"""
+        with self._lock:
+            value = self._conn.execute(
+                "SELECT MAX(last_fetch) FROM bar_meta WHERE interval=?", (interval,)
+            ).fetchone()[0]
+        return value or 0.0
+
+    # --------------------------------------------------
+    # READ / WRITE
+    # --------------------------------------------------
+    def load(self, ticker: str, interval: str, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Load stored bars as a DataFrame shaped like yf.Ticker.history()
+        (DatetimeIndex in the exchange timezone, BAR_COLUMNS columns).
+        """
+        query = (
+            "SELECT ts, open, high, low, close, volume, dividends, splits "
+            "FROM bars WHERE ticker=? AND interval=?"
+        )
+        params = [ticker, interval]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(int(pd.Timestamp(start).timestamp()))
+        query += " ORDER BY ts"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            tz = self._conn.execute(
+                "SELECT tz FROM bar_meta WHERE ticker=? AND interval=?",
+                (ticker, interval)
+            ).fetchone()
+
+        df = pd.DataFrame(rows, columns=["ts"] + BAR_COLUMNS)
+        index = pd.to_datetime(df.pop("ts"), unit="s", utc=True)
+        if tz and tz[0]:
+            index = index.dt.tz_convert(tz[0])
+        df.index = pd.DatetimeIndex(index, name="Date")
+        return df
+
+    def load_panel(self, tickers: List[str], interval: str, start: Optional[pd.Timestamp] = None,
+                   columns=("High", "Low", "Close")) -> Dict[str, pd.DataFrame]:
+        """
+        Stored bars for many tickers as wide panels (UTC DatetimeIndex x tickers),
+        one per requested column; tickers without bars come back as all-NaN columns.
+        """
+        fields = {c: c.lower() if c != "Stock Splits" else "splits" for c in columns}
+        query = (
+            f"SELECT ticker, ts, {', '.join(fields.values())} FROM bars "
+            "WHERE interval=? AND ticker IN ({marks})"
+        )
+        params = [interval]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(int(pd.Timestamp(start).timestamp()))
+
+        rows = []
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            with self._lock:
+                rows += self._conn.execute(
+                    query.format(marks=",".join("?" * len(chunk))),
+                    [params[0], *chunk, *params[1:]]
+                ).fetchall()
+
+        long = pd.DataFrame(rows, columns=["ticker", "ts", *columns])
+        long["ts"] = pd.to_datetime(long["ts"], unit="s", utc=True)
+        return {
+            column: long.pivot(index="ts", columns="ticker", values=column)
+                        .reindex(columns=tickers)
+                        .rename_axis(index="Date", columns=None)
+                        .astype(float)
+            for column in columns
+        }
+
+    def upsert(self, ticker: str, interval: str, df: pd.DataFrame, covered_from: Optional[pd.Timestamp] = None):
+        """
+        Insert or replace bars from a yf history() frame and stamp the fetch time.
+
+        Args:
+            covered_from: start of the period that was requested, so later reads
+                          know how far back the stored history is complete
+        """
+        df = df.reindex(columns=BAR_COLUMNS)
+        tz = str(df.index.tz) if getattr(df.index, "tz", None) is not None else None
+        ts = to_epoch(df.index)
+        rows = [
+            (ticker, interval, t, *(None if pd.isna(v) else float(v) for v in values))
+            for t, values in zip(ts, df.itertuples(index=False, name=None))
+        ]
+        covered = int(pd.Timestamp(covered_from).timestamp()) if covered_from is not None else None
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                """
+                INSERT INTO bar_meta (ticker, interval, tz, covered_from, last_fetch)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (ticker, interval) DO UPDATE SET
+                    tz = COALESCE(excluded.tz, bar_meta.tz),
+                    covered_from = CASE
+                        WHEN excluded.covered_from IS NULL THEN bar_meta.covered_from
+                        WHEN bar_meta.covered_from IS NULL THEN excluded.covered_from
+                        ELSE MIN(excluded.covered_from, bar_meta.covered_from)
+                    END,
+                    last_fetch = excluded.last_fetch
+                """,
+                (ticker, interval, tz, covered, time.time())
+            )
+
+    def clear(self, ticker: str, interval: str):
+        """Forget everything stored for (ticker, interval), e.g. after a split re-adjusts history"""
+        with self._lock, self._conn:
+            for table in ("bars", "bar_meta", "indicator_state"):
+                self._conn.execute(f"DELETE FROM {table} WHERE ticker=? AND interval=?", (ticker, interval))
+
+    # --------------------------------------------------
+    # INDICATOR STATE
+    # --------------------------------------------------
+    def load_states(self, tickers: List[str], interval: str) -> Dict[str, dict]:
+        """Saved IndicatorState dicts (see tools.indicator_state) by ticker"""
+        states = {}
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT ticker, state FROM indicator_state WHERE interval=? AND ticker IN ({marks})",
+                    [interval, *chunk]
+                ).fetchall()
+            states.update({ticker: json.loads(state) for ticker, state in rows})
+        return states
+
+    def save_states(self, interval: str, states: Dict[str, dict]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO indicator_state VALUES (?, ?, ?)",
+                [(ticker, interval, json.dumps(state)) for ticker, state in states.items()]
+            )
+
+
+# Convenience accessor
+_store_instance = None
+_store_lock = threading.Lock()
+
+def get_bar_store() -> BarStore:
+    global _store_instance
+
+    if _store_instance is None:
+        with _store_lock:
+            if _store_instance is None:
+                _store_instance = BarStore()
+
+    return _store_instance
@@ -0,0 +1,181 @@
+# src/tools/beta_tool.py
+"""
+Local betas against the market index, from the bar store.
+
+beta = cov(r_stock, r_index) / var(r_index) on daily log returns, NSE
+symbols against NIFTY 50 and BSE symbols against SENSEX. All tickers are
+done at once from masked column sums (no per-ticker loop), and rolling betas
+come from cumulative sums, so a window costs one subtraction per bar.
+
+The interactive path (get_local_beta) only reads stored bars; the index
+bars are topped up by the fundamentals warmup job and by this CLI, and
+index_bars_current tells callers whether they are recent enough to trust.
+
+Usage (from src/):
+    python -m tools.beta_tool INFY.NS TCS.NS 500325.BO
+    python -m tools.beta_tool --universe --no-refresh
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from tools.bar_store import get_bar_store
+from tools.market_calendar import exchange_for_symbol, sessions_since
+
+BENCHMARKS = {"NSE": "^NSEI", "BSE": "^BSESN"}
+DEFAULT_BENCHMARK = "^NSEI"
+
+BETA_PERIOD = os.getenv("BETA_PERIOD", "1y")
+BETA_MIN_OBS = 60            # fewer overlapping returns -> NaN
+# Index bars this many settled sessions behind still count as current
+# (the warmup job may not have run since the last close yet)
+BETA_MAX_STALE_SESSIONS = int(os.getenv("BETA_MAX_STALE_SESSIONS", "1"))
+ROLLING_WINDOW = 63          # ~3 months of daily bars
+INTERVAL = "1d"
+
+
+def benchmark_for(ticker: str) -> str:
+    return BENCHMARKS.get(exchange_for_symbol(ticker), DEFAULT_BENCHMARK)
+
+
+def refresh_bars(tickers: List[str], period: str = BETA_PERIOD):
+    """Top up the bar store for `tickers` and both indices (one grouped download at most)"""
+    from tools.price_tool import load_history_batch
+
+    load_history_batch(list(dict.fromkeys([*tickers, *BENCHMARKS.values()])), period=period, interval=INTERVAL)
+
+
+def _returns(tickers: List[str], period: str, refresh: bool) -> pd.DataFrame:
+    """Daily log returns (dates x tickers + benchmarks), NaN where a bar is missing"""
+    from tools.price_tool import _period_start
+
+    symbols = list(dict.fromkeys([*tickers, *BENCHMARKS.values()]))
+    if refresh:
+        refresh_bars(tickers, period)
+
+    start = _period_start(period, pd.Timestamp.now(tz="UTC"))
+    close = get_bar_store().load_panel(symbols, INTERVAL, start=start, columns=("Close",))["Close"]
+    # index and stock bars of one session share a date, not always a timestamp
+    close.index = close.index.tz_convert("Asia/Kolkata").normalize()
+    close = close.groupby(level=0).last()
+    return np.log(close).diff().iloc[1:]
+
+
+def _masked_terms(stock: np.ndarray, market: np.ndarray) -> tuple:
+    """
+    Per-bar terms of the beta sums over pairwise-complete observations:
+    (1, m, s, m*m, m*s), zeroed where either return is missing. Summed over
+    all bars for a beta, cumulated for rolling betas.
+    """
+    ok = ~np.isnan(stock) & ~np.isnan(market)[:, None]
+    s = np.where(ok, stock, 0.0)
+    m = np.where(ok, market[:, None], 0.0)
+    return ok.astype(float), m, s, m * m, m * s
+
+
+def _beta_from_sums(n, sm, ss, smm, sms, min_obs: int = BETA_MIN_OBS) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (n * sms - sm * ss) / (n * smm - sm * sm)
+    return np.where(n >= min_obs, beta, np.nan)
+
+
+def compute_betas(tickers: List[str], period: str = BETA_PERIOD, refresh: bool = True) -> pd.DataFrame:
+    """
+    Beta of every ticker against its exchange's index over `period`.
+
+    Returns:
+        frame indexed by ticker with beta, benchmark, observations
+    """
+    returns = _returns(tickers, period, refresh)
+    benchmarks = pd.Series([benchmark_for(t) for t in tickers], index=tickers)
+    stock = returns[tickers].to_numpy()
+
+    beta = np.full(len(tickers), np.nan)
+    observations = np.zeros(len(tickers), dtype=int)
+    for bench in benchmarks.unique():
+        cols = np.flatnonzero(benchmarks.to_numpy() == bench)
+        sums = [x.sum(axis=0) for x in _masked_terms(stock[:, cols], returns[bench].to_numpy())]
+        beta[cols] = _beta_from_sums(*sums)
+        observations[cols] = sums[0]
+
+    return pd.DataFrame({"beta": beta, "benchmark": benchmarks, "observations": observations}, index=tickers)
+
+
+def rolling_betas(tickers: List[str], window: int = ROLLING_WINDOW, period: str = BETA_PERIOD,
+                  refresh: bool = True) -> pd.DataFrame:
+    """Beta over the trailing `window` sessions at every date (dates x tickers)"""
+    returns = _returns(tickers, period, refresh)
+    benchmarks = np.array([benchmark_for(t) for t in tickers])
+    stock = returns[tickers].to_numpy()
+
+    out = np.full(stock.shape, np.nan)
+    for bench in np.unique(benchmarks):
+        cols = np.flatnonzero(benchmarks == bench)
+        sums = []
+        for x in _masked_terms(stock[:, cols], returns[bench].to_numpy()):
+            c = np.cumsum(x, axis=0)
+            c[window:] = c[window:] - c[:-window]
+            sums.append(c)
+        # a short window can never reach BETA_MIN_OBS, so it only needs to be full
+        out[:, cols] = _beta_from_sums(*sums, min_obs=min(window, BETA_MIN_OBS))
+
+    return pd.DataFrame(out, index=returns.index, columns=tickers)
+
+
+def index_bars_current(ticker: str, max_stale: int = BETA_MAX_STALE_SESSIONS) -> bool:
+    """Are the stored bars of `ticker`'s benchmark at most `max_stale` settled sessions behind?"""
+    benchmark = benchmark_for(ticker)
+    meta = get_bar_store().get_meta(benchmark, INTERVAL)
+    if meta is None or meta["last_ts"] is None:
+        return False
+    last_day = pd.Timestamp(meta["last_ts"], unit="s", tz="UTC").tz_convert("Asia/Kolkata").date()
+    return sessions_since(exchange_for_symbol(benchmark), last_day) <= max_stale
+
+
+# Per-ticker cache, invalidated whenever the bar store is written
+_cache: Dict[str, tuple] = {}
+_cache_lock = threading.Lock()
+
+def get_local_beta(ticker: str):
+    """
+    Locally computed beta for one ticker from stored bars only, or None when
+    there is too little history. Never downloads: the ticker's bars are what
+    get_price_data stored (6mo is plenty) and the index bars are topped up by
+    the fundamentals warmup job or `python -m tools.beta_tool`.
+    """
+    stamp = get_bar_store().last_write(INTERVAL)
+    with _cache_lock:
+        hit = _cache.get(ticker)
+    if hit is not None and hit[1] == stamp:
+        return hit[0]
+
+    beta = compute_betas([ticker], refresh=False).loc[ticker, "beta"]
+    beta = None if np.isnan(beta) else round(float(beta), 3)
+    with _cache_lock:
+        _cache[ticker] = (beta, get_bar_store().last_write(INTERVAL))
+    return beta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute betas against NIFTY 50 / SENSEX from stored bars")
+    parser.add_argument("tickers", nargs="*")
+    parser.add_argument("--universe", action="store_true", help="every NSE symbol")
+    parser.add_argument("--period", default=BETA_PERIOD)
+    parser.add_argument("--no-refresh", action="store_true", help="use stored bars only")
+    args = parser.parse_args()
+
+    tickers = args.tickers
+    if args.universe:
+        from tools.universe import load_nse_universe
+        tickers = load_nse_universe()
+
+    started = time.perf_counter()
+    betas = compute_betas(tickers, period=args.period, refresh=not args.no_refresh)
+    print(f"{betas['beta'].notna().sum()}/{len(betas)} betas in {time.perf_counter() - started:.2f}s")
+    print(betas.round(3).to_string() if len(betas) <= 50 else betas["beta"].describe().round(3))
@@ -1,4 +1,4 @@
-import yfinance as yf
+from tools.price_tool import load_history
 
 COMMODITY_MAP = {
     # 🟡 Precious Metals (MCX)
@@ -49,8 +49,8 @@ def get_commodity_price(commodity: str):
     if not symbol:
         raise ValueError("Unsupported commodity")
 
-    ticker = yf.Ticker(symbol)
-    hist = ticker.history(period="1mo")
+    # served from the local bar store; MCX calendar decides when to refetch
+    hist = load_history(symbol, period="1mo", interval="1d", exchange="MCX")
 
     if hist.empty:
         raise ValueError("No price data")
@@ -1,8 +1,9 @@
-import yfinance as yf
+from tools.ticker_info import get_ticker_info
+
+PROFILE_FIELDS = ["sector", "industry", "marketCap", "shortName"]
 
 def get_company_profile(ticker: str) -> dict:
-    stock = yf.Ticker(ticker)
-    info = stock.info
+    info = get_ticker_info(ticker, PROFILE_FIELDS)
 
     return {
         "sector": info.get("sector"),
@@ -11,4 +12,4 @@ def get_company_profile(ticker: str) -> dict:
         "shortName": info.get("shortName")
     }
 
-# print(get_company_profile("Eternal.NS"))
\ No newline at end of file
+# print(get_company_profile("Eternal.NS"))
@@ -0,0 +1,369 @@
+# src/tools/covariance_store.py
+"""
+Persisted exponentially weighted (RiskMetrics) covariance of daily log
+returns across every ticker in the bar store.
+
+    C_t = lam * C_(t-1) + (1 - lam) * r_t r_t'
+
+The store keeps the last COV_WINDOW_BARS sessions of returns (sessions x
+tickers) next to the matrix, plus the last session folded in per ticker.
+The bar store fills each ticker only when it is queried, so tickers catch up
+at different times:
+
+    new sessions     lam^k * C + (1 - lam) * R_new' diag(w) R_new, O(N^2) per bar
+    late bars        a ticker's returns for sessions already in the window are
+                     written into its column and its row / column of C is
+                     recomputed from the window, O(N * T) per late ticker
+    window overflow  the oldest sessions' (negligible) terms are subtracted
+
+so the matrix always equals a rebuild from the stored returns. New tickers
+are simply late tickers with no history yet. Slicing any subset of tickers
+is an index lookup. Everything lives in one .npz file next to the bar store.
+
+Only completed daily bars are folded in (the live bar of the current session
+may still change). Returns are taken against the previous stored close, so a
+ticker re-adjusted after a split / dividend is read back consistently.
+
+Usage (from src/):
+    python -m tools.covariance_store                 # bring up to date
+    python -m tools.covariance_store --rebuild
+    python -m tools.covariance_store --show INFY.NS TCS.NS
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from tools.bar_store import get_bar_store, to_epoch
+
+COV_STORE_PATH = os.getenv(
+    "COV_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "stock_cache", "ewma_cov.npz")
+)
+COV_LAMBDA = float(os.getenv("COV_LAMBDA", "0.94"))
+COV_WINDOW_BARS = 500        # sessions kept; lam^500 is negligible
+COV_WINDOW_DAYS = 730        # how far back a ticker's first load reads
+COV_INTERVAL = "1d"
+SESSION_TZ = "Asia/Kolkata"
+TRADING_DAYS = 252
+
+NEVER = -1                   # folded[] for a ticker that was never loaded
+NOTHING = 0                  # ... loaded, but no bars in the window
+
+
+def log_returns(closes: np.ndarray) -> tuple:
+    """
+    Log returns of a (dates x tickers) close array against each ticker's
+    previous available close.
+
+    Returns:
+        (returns with 0 where there is no return, boolean observed mask)
+    """
+    filled = pd.DataFrame(closes).ffill().to_numpy()
+    prev = np.vstack([np.full(closes.shape[1], np.nan), filled[:-1]])
+    observed = ~np.isnan(closes) & ~np.isnan(prev)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(observed, np.log(closes / prev), 0.0)
+    observed &= np.isfinite(returns)
+    return np.where(observed, returns, 0.0), observed
+
+
+def _sessions(panel: pd.DataFrame) -> tuple:
+    """
+    Completed bars of a Close panel, one row per session date.
+
+    Returns:
+        (closes ndarray, session dates as epoch seconds, per-ticker flag for
+        stored bars that are not complete yet)
+    """
+    cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=1)
+    live = panel.index > cutoff
+    pending = panel[live].notna().any(axis=0).to_numpy()
+
+    done = panel[~live]
+    # index and stock bars of one session share a date, not always a timestamp
+    dates = done.index.tz_convert(SESSION_TZ).normalize()
+    done = done.groupby(dates).last()
+    return done.to_numpy(dtype=float), np.array(to_epoch(done.index), dtype=np.int64), pending
+
+
+class CovarianceStore:
+    def __init__(self, path: str = COV_STORE_PATH, lam: float = COV_LAMBDA):
+        """
+        Args:
+            path: .npz file to persist the matrix in (created on first update)
+            lam: decay per bar (0.94 = RiskMetrics daily, ~11 bar half-life)
+        """
+        self.path = path
+        self.lam = lam
+        # one lock for reads and the whole check / fold / save of an update
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.tickers: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.dates = np.zeros(0, dtype=np.int64)         # session dates in the window
+        self.returns = np.zeros((0, 0))                   # sessions x tickers, 0 = no return
+        self.observed = np.zeros((0, 0), dtype=bool)
+        self.cov = np.zeros((0, 0))
+        self.folded = np.zeros(0, dtype=np.int64)         # last session folded in, per ticker
+        self.pending = np.zeros(0, dtype=bool)            # has stored bars not complete yet
+        self.synced_at = 0.0                              # wall time of the last update
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self.observed.sum(axis=0)
+
+    @property
+    def last_date(self) -> Optional[int]:
+        return int(self.dates[-1]) if len(self.dates) else None
+
+    # --------------------------------------------------
+    # PERSISTENCE
+    # --------------------------------------------------
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if float(data["lam"]) != self.lam:
+                    return
+                self.tickers = [str(t) for t in data["tickers"]]
+                self.index = {t: i for i, t in enumerate(self.tickers)}
+                self.dates = data["dates"]
+                self.returns = data["returns"]
+                self.observed = data["observed"]
+                self.cov = data["cov"]
+                self.folded = data["folded"]
+                self.pending = data["pending"]
+                self.synced_at = float(data["synced_at"])
+        except Exception as e:
+            print(f"Covariance store unreadable, rebuilding: {e}")
+            self._reset()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp.npz"
+        np.savez(
+            tmp,
+            tickers=np.array(self.tickers, dtype=str),
+            dates=self.dates,
+            returns=self.returns,
+            observed=self.observed,
+            cov=self.cov,
+            folded=self.folded,
+            pending=self.pending,
+            synced_at=self.synced_at,
+            lam=self.lam,
+        )
+        os.replace(tmp, self.path)
+
+    # --------------------------------------------------
+    # UPDATES (callers hold self._lock)
+    # --------------------------------------------------
+    def _weights(self, n: int) -> np.ndarray:
+        """(1 - lam) * lam^age for n sessions, newest last"""
+        return (1 - self.lam) * self.lam ** np.arange(n - 1, -1, -1)
+
+    def _add_tickers(self, tickers: List[str]):
+        if not tickers:
+            return
+        n, k = len(self.tickers), len(tickers)
+        self.tickers += tickers
+        self.index.update({t: n + i for i, t in enumerate(tickers)})
+        self.returns = np.hstack([self.returns.reshape(len(self.dates), n), np.zeros((len(self.dates), k))])
+        self.observed = np.hstack([self.observed.reshape(len(self.dates), n), np.zeros((len(self.dates), k), dtype=bool)])
+        cov = np.zeros((n + k, n + k))
+        cov[:n, :n] = self.cov
+        self.cov = cov
+        self.folded = np.concatenate([self.folded, np.full(k, NEVER, dtype=np.int64)])
+        self.pending = np.concatenate([self.pending, np.zeros(k, dtype=bool)])
+
+    def _ingest(self, touched: List[str]) -> bool:
+        """
+        Fold in every completed bar of `touched` newer than its own last folded
+        session. Returns whether anything worth saving changed.
+        """
+        cols = np.array([self.index[t] for t in touched])
+        folded = self.folded[cols]
+        if (folded == NEVER).any() or (folded == NOTHING).any():
+            start = pd.Timestamp.now(tz="UTC").normalize() - pd.Timedelta(days=COV_WINDOW_DAYS)
+        else:
+            # from the last folded session on, which supplies the previous close
+            start = pd.Timestamp(int(folded.min()), unit="s", tz="UTC")
+
+        panel = get_bar_store().load_panel(touched, COV_INTERVAL, start=start, columns=("Close",))["Close"]
+        closes, dates, pending = _sessions(panel)
+        marks_changed = (self.pending[cols] != pending).any() or (folded == NEVER).any()
+        self.pending[cols] = pending
+        self.folded[cols] = np.maximum(folded, NOTHING)
+
+        returns, observed = log_returns(closes)
+        fresh = observed & (dates[:, None] > folded[None, :])
+        if len(self.dates) >= COV_WINDOW_BARS:
+            fresh &= dates[:, None] >= self.dates[0]          # would fall out of the window at once
+        rows, ks = np.nonzero(fresh)
+        if len(rows) == 0:
+            return bool(marks_changed)
+
+        old_dates, old_last = self.dates, self.last_date
+        merged = np.union1d(old_dates, dates[rows])
+        # a session that lands between stored ones shifts every older weight
+        added_dates = np.setdiff1d(merged, old_dates)
+        inserted = old_last is not None and len(added_dates) > 0 and bool(added_dates.min() < old_last)
+
+        T, N = len(merged), len(self.tickers)
+        grown = np.zeros((T, N))
+        grown_obs = np.zeros((T, N), dtype=bool)
+        at = np.searchsorted(merged, old_dates)
+        grown[at] = self.returns.reshape(len(old_dates), N)
+        grown_obs[at] = self.observed.reshape(len(old_dates), N)
+        where = np.searchsorted(merged, dates[rows])
+        grown[where, cols[ks]] = returns[rows, ks]
+        grown_obs[where, cols[ks]] = True
+        self.returns, self.observed, self.dates = grown, grown_obs, merged
+
+        appended = T - len(old_dates) if old_last is None else int((merged > old_last).sum())
+        late = np.unique(cols[ks][dates[rows] <= old_last]) if old_last is not None else np.zeros(0, dtype=int)
+
+        if inserted or len(old_dates) == 0:
+            self._recompute()
+        else:
+            if appended:
+                new = self.returns[-appended:]
+                self.cov = self.lam ** appended * self.cov + (new.T * self._weights(appended)) @ new
+            if len(late):
+                block = (self.returns[:, late].T * self._weights(T)) @ self.returns
+                self.cov[late, :] = block
+                self.cov[:, late] = block.T
+
+        if T > COV_WINDOW_BARS:
+            drop = T - COV_WINDOW_BARS
+            old = self.returns[:drop]
+            self.cov -= (old.T * self._weights(T)[:drop]) @ old
+            self.returns, self.observed, self.dates = self.returns[drop:], self.observed[drop:], self.dates[drop:]
+
+        touched_dates = np.where(fresh, dates[:, None], 0).max(axis=0)
+        self.folded[cols] = np.maximum(self.folded[cols], touched_dates)
+        return True
+
+    def _recompute(self):
+        self.cov = (self.returns.T * self._weights(len(self.dates))) @ self.returns
+
+    def _update(self, tickers: Optional[List[str]]):
+        store = get_bar_store()
+        started = time.time()
+        wanted = tickers if tickers is not None else store.tickers(COV_INTERVAL)
+        added = [t for t in dict.fromkeys(wanted) if t not in self.index]
+        self._add_tickers(added)
+
+        fetched = store.fetch_times(COV_INTERVAL)
+        touched = [
+            t for t, i in self.index.items()
+            if t in fetched and (
+                fetched[t] > self.synced_at or self.folded[i] == NEVER or self.pending[i]
+            )
+        ]
+        changed = self._ingest(touched) if touched else False
+        # writes that land while we read are picked up next time (ingesting is idempotent)
+        self.synced_at = started
+        if changed or added:
+            self._save()
+
+    def update(self, tickers: Optional[List[str]] = None):
+        """
+        Bring the matrix up to date with the bar store: add `tickers` (or the
+        whole bar store universe when None) if new, then fold in the bars of
+        every ticker written since the last update.
+        """
+        with self._lock:
+            self._update(tickers)
+
+    def rebuild(self, tickers: Optional[List[str]] = None):
+        """Forget everything and reload the last COV_WINDOW_DAYS of stored bars"""
+        with self._lock:
+            self._reset()
+            self._update(tickers)
+
+    # --------------------------------------------------
+    # READS
+    # --------------------------------------------------
+    def covariance(self, tickers: List[str], annualize: bool = False, refresh: bool = True) -> pd.DataFrame:
+        """
+        EWMA covariance of daily log returns for a ticker subset (NaN where a
+        ticker has no observed returns).
+        """
+        with self._lock:
+            if refresh:
+                self._update(tickers)
+
+            idx = np.array([self.index.get(t, -1) for t in tickers], dtype=int)
+            known = idx >= 0
+            cov = np.full((len(tickers), len(tickers)), np.nan)
+            sub = idx[known]
+            counts = self.observed[:, sub].sum(axis=0) if len(self.dates) else np.zeros(len(sub), dtype=int)
+            # bias correction for tickers with a short history: the weights seen so far sum to 1 - lam^n
+            # (tickers without any returns get NaN before the multiply, so no 0 * inf)
+            observed = counts > 0
+            inv = np.full(len(sub), np.nan)
+            inv[observed] = 1 / np.sqrt(1 - self.lam ** counts[observed])
+            cov[np.ix_(known, known)] = self.cov[np.ix_(sub, sub)] * np.outer(inv, inv)
+
+        if annualize:
+            cov = cov * TRADING_DAYS
+        return pd.DataFrame(cov, index=tickers, columns=tickers)
+
+    def correlation(self, tickers: List[str], refresh: bool = True) -> pd.DataFrame:
+        cov = self.covariance(tickers, refresh=refresh).to_numpy()
+        vol = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.clip(cov / np.outer(vol, vol), -1.0, 1.0)
+        return pd.DataFrame(corr, index=tickers, columns=tickers)
+
+    def volatility(self, tickers: List[str], annualize: bool = True, refresh: bool = True) -> pd.Series:
+        """EWMA volatility of daily log returns (annualized by default)"""
+        cov = self.covariance(tickers, annualize=annualize, refresh=refresh)
+        return pd.Series(np.sqrt(np.diag(cov.to_numpy())), index=tickers)
+
+
+# Convenience accessor
+_store_instance = None
+_store_lock = threading.Lock()
+
+def get_covariance_store() -> CovarianceStore:
+    global _store_instance
+
+    if _store_instance is None:
+        with _store_lock:
+            if _store_instance is None:
+                _store_instance = CovarianceStore()
+
+    return _store_instance
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the EWMA covariance store from the bar store")
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--show", nargs="*", help="print the correlation matrix of these tickers")
+    args = parser.parse_args()
+
+    cov_store = get_covariance_store()
+    started = time.perf_counter()
+    if args.rebuild:
+        cov_store.rebuild()
+    else:
+        cov_store.update()
+    last = cov_store.last_date
+    print(f"{len(cov_store.tickers)} tickers, {len(cov_store.dates)} sessions, last "
+          f"{pd.Timestamp(last, unit='s', tz='UTC').tz_convert(SESSION_TZ).date() if last else '-'} "
+          f"({time.perf_counter() - started:.2f}s)")
+
+    if args.show:
+        print(cov_store.correlation(args.show, refresh=False).round(3))
@@ -0,0 +1,136 @@
+# src/tools/fundamentals_store.py
+"""
+Local fundamentals table (one row per ticker), filled by the warmup job in
+tools/fundamentals_warmup.py and read by get_fundamentals before it ever
+touches yfinance `.info`.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+FUNDAMENTALS_STORE_PATH = os.getenv(
+    "FUNDAMENTALS_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "stock_cache", "fundamentals.sqlite")
+)
+
+# table column -> yfinance .info field
+FIELD_MAP = {
+    "pe": "trailingPE",
+    "eps": "trailingEps",
+    "beta": "beta",
+    "sector": "sector",
+    "industry": "industry",
+    "market_cap": "marketCap",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fundamentals (
+    ticker TEXT PRIMARY KEY,
+    pe REAL, eps REAL, beta REAL,
+    sector TEXT, industry TEXT, market_cap REAL,
+    fetched_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fundamentals_failures (
+    ticker TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    last_attempt REAL
+);
+"""
+
+
+def row_from_info(ticker: str, info: dict) -> dict:
+    """Table row for a yfinance .info payload"""
+    row = {col: info.get(field) for col, field in FIELD_MAP.items()}
+    row["ticker"] = ticker
+    row["fetched_at"] = time.time()
+    return row
+
+
+class FundamentalsStore:
+    def __init__(self, path: str = FUNDAMENTALS_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, ticker: str) -> Optional[dict]:
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM fundamentals WHERE ticker=?", (ticker,))
+            row = cur.fetchone()
+            names = [d[0] for d in cur.description]
+        return dict(zip(names, row)) if row else None
+
+    def upsert_many(self, rows: List[Dict]):
+        """Write fetched rows and clear their failure records"""
+        if not rows:
+            return
+        cols = ["ticker", *FIELD_MAP, "fetched_at"]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO fundamentals ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                [tuple(r.get(c) for c in cols) for r in rows]
+            )
+            self._conn.executemany(
+                "DELETE FROM fundamentals_failures WHERE ticker=?",
+                [(r["ticker"],) for r in rows]
+            )
+
+    def record_failure(self, ticker: str, error: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO fundamentals_failures VALUES (?, 1, ?, ?)
+                ON CONFLICT (ticker) DO UPDATE SET
+                    attempts = attempts + 1,
+                    last_error = excluded.last_error,
+                    last_attempt = excluded.last_attempt
+                """,
+                (ticker, error[:500], time.time())
+            )
+
+    def pending(self, tickers: List[str], max_age: float, max_attempts: int) -> List[str]:
+        """
+        Tickers that still need a fetch: no row younger than `max_age` seconds,
+        and fewer than `max_attempts` failed attempts within that window.
+        """
+        cutoff = time.time() - max_age
+        with self._lock:
+            fresh = {
+                t for (t,) in self._conn.execute("SELECT ticker FROM fundamentals WHERE fetched_at >= ?", (cutoff,))
+            }
+            exhausted = {
+                t for (t,) in self._conn.execute(
+                    "SELECT ticker FROM fundamentals_failures WHERE attempts >= ? AND last_attempt >= ?",
+                    (max_attempts, cutoff)
+                )
+            }
+        return [t for t in tickers if t not in fresh and t not in exhausted]
+
+    def load_table(self) -> pd.DataFrame:
+        """The whole table, indexed by ticker"""
+        with self._lock:
+            return pd.read_sql_query("SELECT * FROM fundamentals", self._conn, index_col="ticker")
+
+
+# Convenience accessor
+_store_instance = None
+_store_lock = threading.Lock()
+
+def get_fundamentals_store() -> FundamentalsStore:
+    global _store_instance
+
+    if _store_instance is None:
+        with _store_lock:
+            if _store_instance is None:
+                _store_instance = FundamentalsStore()
+
+    return _store_instance
@@ -1,12 +1,60 @@
-import yfinance as yf
+import os
+import time
+
+from tools.beta_tool import get_local_beta, index_bars_current
+from tools.fundamentals_store import get_fundamentals_store, row_from_info
+from tools.ticker_info import get_ticker_info
+from utils.diagnostics import diag
+
+FUNDAMENTAL_FIELDS = ["trailingPE", "trailingEps", "sector", "beta"]
+
+# Rows written by the warmup job are served for this long before .info is asked again
+FUNDAMENTALS_MAX_AGE_HOURS = float(os.getenv("FUNDAMENTALS_MAX_AGE_HOURS", "72"))
+
+# "local": beta from stored bars vs NIFTY 50 / SENSEX, .info beta as fallback
+#          (also when the stored index bars are stale);
+# "info": .info beta, local beta only when .info has none
+# beta_source is "local_stale" when stale index bars were all there was
+BETA_SOURCE = os.getenv("BETA_SOURCE", "local")
+
+
+def _beta(ticker: str, info_beta):
+    """(beta, source) following BETA_SOURCE"""
+    if BETA_SOURCE == "info" and info_beta is not None:
+        return info_beta, "info"
+    try:
+        local = get_local_beta(ticker)
+        current = local is not None and index_bars_current(ticker)
+    except Exception as e:
+        err = str(e)
+        diag("fundamentals.local_beta_failed", lambda: {"ticker": ticker, "error": err})
+        local, current = None, False
+
+    if local is not None and not current:
+        diag("fundamentals.index_bars_stale", lambda: {"ticker": ticker, "local": local, "info": info_beta})
+    if local is not None and (current or info_beta is None):
+        return local, "local" if current else "local_stale"
+    return info_beta, "info" if info_beta is not None else None
+
 
 def get_fundamentals(ticker: str):
-    t = yf.Ticker(ticker)
-    info = t.info
+    store = get_fundamentals_store()
+    row = store.get(ticker)
+
+    if row is None or time.time() - row["fetched_at"] > FUNDAMENTALS_MAX_AGE_HOURS * 3600:
+        info = get_ticker_info(ticker, FUNDAMENTAL_FIELDS)
+        row = row_from_info(ticker, info.info)
+        row["fetched_at"] = info.fetched_at
+        store.upsert_many([row])
+
+    beta, beta_source = _beta(ticker, row["beta"])
+
     return {
-        "PE_ratio": info.get("trailingPE"),
-        "EPS": info.get("trailingEps"),
-        "sector": info.get("sector"),
-        "beta": info.get("beta")
+        "PE_ratio": row["pe"],
+        "EPS": row["eps"],
+        "sector": row["sector"],
+        "beta": beta,
+        "beta_source": beta_source
     }
-# print(get_fundamentals(ticker="INFY.NS"))
\ No newline at end of file
+
+# print(get_fundamentals(ticker="INFY.NS"))
@@ -0,0 +1,164 @@
+# src/tools/fundamentals_warmup.py
+"""
+Universe-wide fundamentals warmup.
+
+Fetches `.info` for every symbol in tools/stock_cache/nse_stocks.csv across
+a bounded process pool and writes PE, EPS, beta, sector, industry and market
+cap into the fundamentals table. All workers share one rate limiter per
+host. Every result is written as soon as it arrives, so an interrupted run
+picks up where it stopped (already fresh tickers are skipped, failures are
+retried up to --max-attempts). It also tops up the NIFTY 50 / SENSEX bars
+that the local betas (tools/beta_tool.py) read.
+
+Usage (from src/):
+    python -m tools.fundamentals_warmup --workers 4 --rate 2
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional
+
+from tools.beta_tool import refresh_bars
+from tools.fundamentals_store import get_fundamentals_store, row_from_info
+from tools.universe import load_nse_universe
+
+YAHOO_HOST = "query2.finance.yahoo.com"
+
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 2.0           # requests / second / host, shared by all workers
+DEFAULT_MAX_AGE_HOURS = 20
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class HostRateLimiter:
+    """Spaces out requests to one host across processes (shared next-slot clock)"""
+
+    def __init__(self, host: str, rate: float, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.host = host
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = ctx.Value("d", 0.0)
+
+    def acquire(self):
+        with self._next.get_lock():
+            now = time.time()
+            slot = max(now, self._next.value)
+            self._next.value = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# set in each worker by _init_worker
+_limiters = {}
+
+def _init_worker(limiters: dict):
+    global _limiters
+    _limiters = limiters
+
+
+def _fetch_one(ticker: str) -> dict:
+    import yfinance as yf
+
+    _limiters[YAHOO_HOST].acquire()
+    info = yf.Ticker(ticker).info
+    if not info or len(info) <= 1:
+        raise ValueError("empty .info payload")
+    return row_from_info(ticker, info)
+
+
+def run_warmup(
+    tickers: Optional[List[str]] = None,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = DEFAULT_RATE,
+    max_age_hours: float = DEFAULT_MAX_AGE_HOURS,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> dict:
+    """
+    Fill the fundamentals table.
+
+    Returns:
+        {"total", "skipped", "fetched", "failed", "seconds"}
+    """
+    store = get_fundamentals_store()
+    tickers = tickers or load_nse_universe()
+    todo = store.pending(tickers, max_age=max_age_hours * 3600, max_attempts=max_attempts)
+
+    started = time.time()
+    fetched = failed = reported = 0
+
+    ctx = mp.get_context()
+    limiters = {YAHOO_HOST: HostRateLimiter(YAHOO_HOST, rate, ctx)}
+    print(f"🔥 Fundamentals warmup: {len(todo)} to fetch, {len(tickers) - len(todo)} already fresh")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(limiters,)) as pool:
+        queue = iter(todo)
+        in_flight = {}
+
+        # keep a bounded number of tasks queued so an interrupt loses little work
+        def _fill():
+            while len(in_flight) < workers * 2:
+                ticker = next(queue, None)
+                if ticker is None:
+                    return
+                in_flight[pool.submit(_fetch_one, ticker)] = ticker
+
+        _fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            rows = []
+            for future in done:
+                ticker = in_flight.pop(future)
+                try:
+                    rows.append(future.result())
+                    fetched += 1
+                except Exception as e:
+                    store.record_failure(ticker, f"{type(e).__name__}: {e}")
+                    failed += 1
+            store.upsert_many(rows)
+
+            if (fetched + failed) // 100 > reported:
+                reported = (fetched + failed) // 100
+                print(f"  ↳ {fetched + failed}/{len(todo)} ({failed} failed)")
+            _fill()
+
+    # index bars for the local betas (tools/beta_tool.py), which never download on a query
+    try:
+        refresh_bars([])
+    except Exception as e:
+        print(f"Index bar refresh failed: {e}")
+
+    summary = {
+        "total": len(tickers),
+        "skipped": len(tickers) - len(todo),
+        "fetched": fetched,
+        "failed": failed,
+        "seconds": round(time.time() - started, 1),
+    }
+    print(f"✓ Warmup done: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill the local fundamentals table for the NSE universe")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="max requests/second to Yahoo")
+    parser.add_argument("--max-age-hours", type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help="skip tickers fetched more recently than this")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    parser.add_argument("--limit", type=int, default=None, help="only the first N symbols")
+    args = parser.parse_args()
+
+    universe = load_nse_universe()
+    if args.limit:
+        universe = universe[:args.limit]
+
+    run_warmup(
+        universe,
+        workers=args.workers,
+        rate=args.rate,
+        max_age_hours=args.max_age_hours,
+        max_attempts=args.max_attempts,
+    )
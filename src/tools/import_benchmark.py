@@ -0,0 +1,60 @@
+# src/tools/import_benchmark.py
+"""
+Import-time benchmark for the tool modules.
+
+Each module is imported in a fresh interpreter (nothing already cached in
+sys.modules), best of --repeat runs. Use it to check that heavy clients
+and models stay lazy.
+
+Usage (from src/):
+    python -m tools.import_benchmark
+    python -m tools.import_benchmark tools.social_news_tool --repeat 10
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import List
+
+DEFAULT_MODULES = [
+    "tools.social_news_tool",
+    "tools.news_tool",
+    "tools.sentiment_model",
+    "tools.price_tool",
+]
+
+_PROBE = (
+    "import time, importlib, sys; "
+    "t = time.perf_counter(); importlib.import_module(sys.argv[1]); "
+    "print(time.perf_counter() - t)"
+)
+
+
+def import_seconds(module: str, repeat: int = 5) -> float:
+    """Best-of-`repeat` wall time to import `module` in a clean interpreter"""
+    best = float("inf")
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, module],
+            capture_output=True, text=True, check=True
+        )
+        best = min(best, float(out.stdout.strip().splitlines()[-1]))
+    return best
+
+
+def run(modules: List[str], repeat: int = 5):
+    print(f"{'module':<32}{'import ms':>12}")
+    for module in modules:
+        try:
+            print(f"{module:<32}{1000 * import_seconds(module, repeat):>12.1f}")
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr.strip().splitlines() or ["failed"])[-1]
+            print(f"{module:<32}  error: {error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure module import time")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.modules, args.repeat)
@@ -0,0 +1,292 @@
+# src/tools/indicator_state.py
+"""
+O(1) incremental indicator state.
+
+Each object holds just enough to advance its indicator by one bar, using
+the same recurrences as tools/indicators.py, so stepping a state through
+a history gives the same values as the panel engine. States serialize to
+plain dicts and are persisted per (ticker, interval) in the bar store.
+"""
+
+import math
+from typing import List, Optional
+
+import numpy as np
+
+from tools.indicators import (
+    RSI_LENGTH, ATR_LENGTH, MACD_FAST, MACD_SLOW, MACD_SIGNAL,
+    compute_indicator_arrays,
+)
+
+NAN = float("nan")
+
+
+def _num(x):
+    """float or None, for JSON"""
+    return None if x is None or math.isnan(x) else float(x)
+
+
+def _val(x):
+    return NAN if x is None else float(x)
+
+
+class EWMState:
+    """One step of pandas `ewm(alpha=..., adjust=..., min_periods=...).mean()`"""
+    __slots__ = ("alpha", "adjust", "min_periods", "mean", "old_wt", "nobs")
+
+    def __init__(self, alpha: float, adjust: bool, min_periods: int = 0,
+                 mean: float = NAN, old_wt: float = 1.0, nobs: int = 0):
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.mean = mean
+        self.old_wt = old_wt
+        self.nobs = nobs
+
+    @property
+    def value(self) -> float:
+        return self.mean if self.nobs >= self.min_periods else NAN
+
+    def update(self, x: float) -> float:
+        if math.isnan(x):
+            if not math.isnan(self.mean):
+                self.old_wt *= 1.0 - self.alpha
+            return self.value
+
+        if math.isnan(self.mean):
+            self.mean = x
+        else:
+            new_wt = 1.0 if self.adjust else self.alpha
+            self.old_wt *= 1.0 - self.alpha
+            if self.mean != x:
+                self.mean = (self.old_wt * self.mean + new_wt * x) / (self.old_wt + new_wt)
+            self.old_wt = self.old_wt + new_wt if self.adjust else 1.0
+
+        self.nobs += 1
+        return self.value
+
+    def to_dict(self) -> dict:
+        return {"mean": _num(self.mean), "old_wt": self.old_wt, "nobs": self.nobs}
+
+    def load(self, d: dict):
+        self.mean = _val(d["mean"])
+        self.old_wt = d["old_wt"]
+        self.nobs = d["nobs"]
+        return self
+
+
+class EMAState:
+    """SMA-seeded EMA (pandas_ta style)"""
+    __slots__ = ("length", "seed_sum", "seed_count", "ewm")
+
+    def __init__(self, length: int):
+        self.length = length
+        self.seed_sum = 0.0
+        self.seed_count = 0
+        self.ewm = EWMState(alpha=2.0 / (length + 1), adjust=False)
+
+    @property
+    def value(self) -> float:
+        return self.ewm.value
+
+    def update(self, x: float) -> float:
+        if math.isnan(x):
+            return self.value
+        if self.seed_count < self.length:
+            self.seed_sum += x
+            self.seed_count += 1
+            if self.seed_count < self.length:
+                return NAN
+            x = self.seed_sum / self.length
+        return self.ewm.update(x)
+
+    def to_dict(self) -> dict:
+        return {"seed_sum": self.seed_sum, "seed_count": self.seed_count, "ewm": self.ewm.to_dict()}
+
+    def load(self, d: dict):
+        self.seed_sum = d["seed_sum"]
+        self.seed_count = d["seed_count"]
+        self.ewm.load(d["ewm"])
+        return self
+
+
+class RSIState:
+    """Wilder RSI: RMA of gains and losses"""
+    __slots__ = ("prev_close", "gain", "loss")
+
+    def __init__(self, length: int = RSI_LENGTH):
+        self.prev_close = NAN
+        self.gain = EWMState(alpha=1.0 / length, adjust=True, min_periods=length)
+        self.loss = EWMState(alpha=1.0 / length, adjust=True, min_periods=length)
+
+    @property
+    def value(self) -> float:
+        gain, loss = self.gain.value, self.loss.value
+        denom = gain + abs(loss)
+        return 100.0 * gain / denom if denom else NAN
+
+    def update(self, close: float) -> float:
+        if math.isnan(close):
+            return self.value
+        if not math.isnan(self.prev_close):
+            diff = close - self.prev_close
+            self.gain.update(0.0 if diff < 0 else diff)
+            self.loss.update(0.0 if diff > 0 else diff)
+        self.prev_close = close
+        return self.value
+
+    def to_dict(self) -> dict:
+        return {"prev_close": _num(self.prev_close), "gain": self.gain.to_dict(), "loss": self.loss.to_dict()}
+
+    def load(self, d: dict):
+        self.prev_close = _val(d["prev_close"])
+        self.gain.load(d["gain"])
+        self.loss.load(d["loss"])
+        return self
+
+
+class MACDState:
+    """MACD line (EMA fast - EMA slow) and its signal EMA"""
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL):
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+
+    @property
+    def value(self) -> tuple:
+        return self.fast.value - self.slow.value, self.signal.value
+
+    def update(self, close: float) -> tuple:
+        macd = self.fast.update(close) - self.slow.update(close)
+        return macd, self.signal.update(macd)
+
+    def to_dict(self) -> dict:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(), "signal": self.signal.to_dict()}
+
+    def load(self, d: dict):
+        self.fast.load(d["fast"])
+        self.slow.load(d["slow"])
+        self.signal.load(d["signal"])
+        return self
+
+
+class ATRState:
+    """Average true range, RMA smoothed"""
+    __slots__ = ("prev_close", "tr")
+
+    def __init__(self, length: int = ATR_LENGTH):
+        self.prev_close = NAN
+        self.tr = EWMState(alpha=1.0 / length, adjust=True, min_periods=length)
+
+    @property
+    def value(self) -> float:
+        return self.tr.value
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if math.isnan(close):
+            return self.value
+        if not math.isnan(self.prev_close):
+            ranges = [abs(r) for r in (high - low, high - self.prev_close, self.prev_close - low) if not math.isnan(r)]
+            self.tr.update(max(ranges) if ranges else NAN)
+        self.prev_close = close
+        return self.value
+
+    def to_dict(self) -> dict:
+        return {"prev_close": _num(self.prev_close), "tr": self.tr.to_dict()}
+
+    def load(self, d: dict):
+        self.prev_close = _val(d["prev_close"])
+        self.tr.load(d["tr"])
+        return self
+
+
+class IndicatorState:
+    """All price_tool indicators for one ticker, as of bar `ts` (epoch seconds)"""
+    __slots__ = ("ts", "rsi", "macd", "ema10", "ema50", "atr")
+
+    def __init__(self, ts: Optional[int] = None):
+        self.ts = ts
+        self.rsi = RSIState()
+        self.macd = MACDState()
+        self.ema10 = EMAState(10)
+        self.ema50 = EMAState(50)
+        self.atr = ATRState()
+
+    def values(self) -> dict:
+        macd, signal = self.macd.value
+        return {
+            "RSI": self.rsi.value,
+            "MACD": macd,
+            "MACD_signal": signal,
+            "EMA10": self.ema10.value,
+            "EMA50": self.ema50.value,
+            "ATR": self.atr.value,
+        }
+
+    def update(self, high: float, low: float, close: float, ts: Optional[int] = None) -> dict:
+        """Advance by one bar and return the indicator values after it"""
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.ema10.update(close)
+        self.ema50.update(close)
+        self.atr.update(high, low, close)
+        if ts is not None:
+            self.ts = ts
+        return self.values()
+
+    def copy(self) -> "IndicatorState":
+        return IndicatorState.from_dict(self.to_dict())
+
+    def to_dict(self) -> dict:
+        return {
+            "ts": self.ts,
+            "rsi": self.rsi.to_dict(),
+            "macd": self.macd.to_dict(),
+            "ema10": self.ema10.to_dict(),
+            "ema50": self.ema50.to_dict(),
+            "atr": self.atr.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "IndicatorState":
+        state = cls(ts=d.get("ts"))
+        state.rsi.load(d["rsi"])
+        state.macd.load(d["macd"])
+        state.ema10.load(d["ema10"])
+        state.ema50.load(d["ema50"])
+        state.atr.load(d["atr"])
+        return state
+
+
+def _column(final, j: int):
+    """Pick column j out of the nested arrays returned by compute_indicator_arrays"""
+    if isinstance(final, dict):
+        return {k: _column(v, j) for k, v in final.items()}
+    value = final[j].item()
+    return _num(value) if isinstance(value, float) else value
+
+
+def states_from_arrays(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                       ts: Optional[List[int]] = None) -> List[IndicatorState]:
+    """
+    Seed one IndicatorState per column from a history panel in a single
+    vectorized pass (same layout as compute_indicator_arrays).
+
+    Args:
+        ts: timestamp of the last bar per column, stored on each state
+    """
+    if np.shape(close)[0] == 0:
+        n = np.shape(close)[1] if np.ndim(close) == 2 else 1
+        return [IndicatorState() for _ in range(n)]
+
+    _, final = compute_indicator_arrays(close, high, low, return_final=True)
+    n = len(final["rsi"]["prev_close"])
+
+    states = []
+    for j in range(n):
+        d = _column(final, j)
+        d["ts"] = ts[j] if ts is not None else None
+        states.append(IndicatorState.from_dict(d))
+    return states
@@ -0,0 +1,213 @@
+# src/tools/indicators.py
+"""
+Vectorized panel indicator engine.
+
+Takes close/high/low panels (dates x tickers) and computes RSI, MACD,
+EMA10, EMA50 and ATR for every column at once with NumPy recurrences.
+The recurrences mirror pandas `ewm` and the pandas_ta defaults used by
+price_tool (RSI 14, MACD 12/26/9, SMA-seeded EMA, RMA-smoothed ATR 14),
+so results match the per-ticker pandas_ta calls within float tolerance.
+"""
+
+import sys
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+RSI_LENGTH = 14
+ATR_LENGTH = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+EMA_LENGTHS = (10, 50)
+
+Panel = Union[pd.DataFrame, np.ndarray]
+
+
+# --------------------------------------------------
+# RECURRENCES
+# --------------------------------------------------
+def _ewm(x: np.ndarray, alpha: float, adjust: bool, min_periods: int = 0):
+    """
+    Column-wise pandas `ewm(alpha=..., adjust=..., min_periods=...).mean()`.
+
+    Returns:
+        (values, final) where final = {"mean", "old_wt", "nobs"} arrays hold
+        the recurrence state after the last row
+    """
+    T, N = x.shape
+    out = np.full((T, N), np.nan)
+    mean = np.full(N, np.nan)
+    old_wt = np.ones(N)
+    nobs = np.zeros(N)
+    new_wt = 1.0 if adjust else alpha
+    decay = 1.0 - alpha
+    min_periods = max(min_periods, 1)
+
+    for t in range(T):
+        cur = x[t]
+        obs = ~np.isnan(cur)
+        started = ~np.isnan(mean)
+
+        old_wt = np.where(started, old_wt * decay, old_wt)
+        upd = started & obs & (mean != cur)
+        mean = np.where(upd, (old_wt * mean + new_wt * np.where(obs, cur, 0.0)) / (old_wt + new_wt), mean)
+        old_wt = np.where(started & obs, old_wt + new_wt if adjust else 1.0, old_wt)
+        mean = np.where(~started & obs, cur, mean)
+
+        nobs += obs
+        out[t] = np.where(nobs >= min_periods, mean, np.nan)
+
+    return out, {"mean": mean, "old_wt": old_wt, "nobs": nobs}
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    """Row index of the first non-NaN value per column (T if none)"""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), x.shape[0])
+
+
+def _rma(x: np.ndarray, length: int):
+    return _ewm(x, alpha=1.0 / length, adjust=True, min_periods=length)
+
+
+def _ema(x: np.ndarray, length: int):
+    """pandas_ta ema: first value is the SMA of the first `length` bars"""
+    T, N = x.shape
+    first = _first_valid(x)
+    seed_row = first + length - 1
+    ok = seed_row < T
+
+    csum = np.vstack([np.zeros(N), np.nancumsum(x, axis=0)])
+    ccount = np.vstack([np.zeros(N), np.cumsum(~np.isnan(x), axis=0)])
+    cols = np.arange(N)
+    end = np.minimum(seed_row + 1, T)
+    seed_sum = csum[end, cols] - csum[np.minimum(first, T), cols]
+    seed_count = ccount[end, cols] - ccount[np.minimum(first, T), cols]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        seed = seed_sum / seed_count
+
+    seeded = np.where(np.arange(T)[:, None] < seed_row[None, :], np.nan, x)
+    seeded[seed_row[ok], cols[ok]] = seed[ok]
+    seeded[:, ~ok] = np.nan
+    values, final = _ewm(seeded, alpha=2.0 / (length + 1), adjust=False)
+    return values, {"seed_sum": seed_sum, "seed_count": seed_count, "ewm": final}
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    high_low = high - low
+    # pandas_ta non_zero_range: nudge the whole series if any range is zero
+    high_low = high_low + np.where((high_low == 0).any(axis=0), sys.float_info.epsilon, 0.0)
+
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    ranges = np.stack([high_low, high - prev_close, prev_close - low])
+    with np.errstate(invalid="ignore"):
+        tr = np.fmax.reduce(np.abs(ranges), axis=0)
+
+    # first bar of each series has no previous close
+    first = _first_valid(close)
+    ok = first < close.shape[0]
+    tr[first[ok], np.arange(close.shape[1])[ok]] = np.nan
+    return tr
+
+
+def _pack(valid: np.ndarray) -> np.ndarray:
+    """Row order that moves each column's missing rows to the top, keeping the rest in order"""
+    return np.argsort(valid, axis=0, kind="stable")
+
+
+# --------------------------------------------------
+# PUBLIC API
+# --------------------------------------------------
+def compute_indicator_arrays(close: np.ndarray, high: np.ndarray, low: np.ndarray, return_final: bool = False):
+    """
+    Indicators for 2-D float arrays (rows = bars in time order, columns = tickers).
+
+    Columns are treated as independent series: gaps (NaN closes) are squeezed
+    out before the recurrences run, so every column gets exactly what the
+    per-ticker pandas_ta calls would give on that ticker's own history.
+
+    Args:
+        return_final: also return the recurrence state after the last bar
+                      (see tools.indicator_state.states_from_arrays)
+    """
+    close = np.asarray(close, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    if close.ndim == 1:
+        close, high, low = close[:, None], high[:, None], low[:, None]
+
+    valid = ~np.isnan(close)
+    order = _pack(valid)
+    c = np.take_along_axis(close, order, axis=0)
+    h = np.take_along_axis(high, order, axis=0)
+    l = np.take_along_axis(low, order, axis=0)
+
+    # RSI (Wilder / RMA smoothing)
+    diff = np.vstack([np.full((1, c.shape[1]), np.nan), np.diff(c, axis=0)])
+    gain = np.where(diff < 0, 0.0, diff)
+    loss = np.where(diff > 0, 0.0, diff)
+    gain_avg, gain_final = _rma(gain, RSI_LENGTH)
+    loss_avg, loss_final = _rma(loss, RSI_LENGTH)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100.0 * gain_avg / (gain_avg + np.abs(loss_avg))
+
+    # MACD line + signal
+    fast, fast_final = _ema(c, MACD_FAST)
+    slow, slow_final = _ema(c, MACD_SLOW)
+    macd = fast - slow
+    signal, signal_final = _ema(macd, MACD_SIGNAL)
+
+    last_close = c[-1] if len(c) else np.full(c.shape[1], np.nan)
+    result = {
+        "RSI": rsi,
+        "MACD": macd,
+        "MACD_signal": signal,
+    }
+    final = {
+        "rsi": {"prev_close": last_close, "gain": gain_final, "loss": loss_final},
+        "macd": {"fast": fast_final, "slow": slow_final, "signal": signal_final},
+    }
+    for length in EMA_LENGTHS:
+        result[f"EMA{length}"], final[f"ema{length}"] = _ema(c, length)
+    result["ATR"], tr_final = _rma(_true_range(h, l, c), ATR_LENGTH)
+    final["atr"] = {"prev_close": last_close, "tr": tr_final}
+
+    # back to the original row positions; bars without a close stay NaN
+    inverse = np.argsort(order, axis=0, kind="stable")
+    for name, values in result.items():
+        values = np.take_along_axis(values, inverse, axis=0)
+        values[~valid] = np.nan
+        result[name] = values
+
+    if return_final:
+        return result, final
+    return result
+
+
+def compute_panel_indicators(close: Panel, high: Panel, low: Panel) -> Dict[str, pd.DataFrame]:
+    """
+    Indicators for DataFrame panels (index = dates, columns = tickers).
+
+    Returns:
+        {"RSI", "MACD", "MACD_signal", "EMA10", "EMA50", "ATR"} -> DataFrame
+        shaped like `close`
+    """
+    if not isinstance(close, pd.DataFrame):
+        return compute_indicator_arrays(close, high, low)
+
+    high = high.reindex(index=close.index, columns=close.columns)
+    low = low.reindex(index=close.index, columns=close.columns)
+    arrays = compute_indicator_arrays(close.to_numpy(), high.to_numpy(), low.to_numpy())
+
+    return {
+        name: pd.DataFrame(values, index=close.index, columns=close.columns)
+        for name, values in arrays.items()
+    }
+
+
+def latest_indicators(panel: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Last available value of every indicator per ticker (rows = tickers)"""
+    return pd.DataFrame({
+        name: values.ffill().iloc[-1] if len(values) else pd.Series(dtype=float)
+        for name, values in panel.items()
+    })
@@ -0,0 +1,173 @@
+# src/tools/market_calendar.py
+"""
+Offline exchange calendar for NSE, BSE and MCX.
+
+Cache layers use it to decide whether locally stored bars can still
+change: once a session has closed (plus a settle buffer for the data
+vendor) and the bars were fetched after that, nothing new can arrive
+until the next session opens - so no network call is needed after the
+close, over weekends or on exchange holidays.
+"""
+
+import json
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+IST = ZoneInfo("Asia/Kolkata")
+
+# Regular sessions (IST)
+SESSIONS = {
+    "NSE": (time(9, 15), time(15, 30)),
+    "BSE": (time(9, 15), time(15, 30)),
+    "MCX": (time(9, 0), time(23, 55)),
+}
+
+# Minutes after the close before the vendor's daily bar is treated as final
+SETTLE_MINUTES = int(os.getenv("MARKET_SETTLE_MINUTES", "30"))
+
+# Equity segment trading holidays (NSE and BSE publish the same list).
+# Extend or correct via MARKET_HOLIDAYS_PATH when the exchange circular is out.
+_EQUITY_HOLIDAYS = {
+    # 2025
+    "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14",
+    "2025-04-18", "2025-05-01", "2025-08-15", "2025-08-27", "2025-10-02",
+    "2025-10-21", "2025-10-22", "2025-11-05", "2025-12-25",
+    # 2026
+    "2026-01-26", "2026-03-03", "2026-03-26", "2026-03-31", "2026-04-03",
+    "2026-04-14", "2026-05-01", "2026-05-28", "2026-06-26", "2026-09-14",
+    "2026-10-02", "2026-10-20", "2026-11-10", "2026-11-24", "2026-12-25",
+}
+
+# MCX keeps its evening session on most equity holidays, so only full-day
+# closures are listed; anything missing here just means an extra fetch.
+_MCX_HOLIDAYS = {
+    "2025-04-18", "2025-10-02", "2025-12-25",
+    "2026-01-26", "2026-04-03", "2026-10-02", "2026-12-25",
+}
+
+
+def _load_holidays() -> dict:
+    holidays = {
+        "NSE": set(_EQUITY_HOLIDAYS),
+        "BSE": set(_EQUITY_HOLIDAYS),
+        "MCX": set(_MCX_HOLIDAYS),
+    }
+
+    path = os.getenv("MARKET_HOLIDAYS_PATH")
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for exchange, days in json.load(f).items():
+                holidays.setdefault(exchange.upper(), set()).update(days)
+
+    return {
+        exchange: {date.fromisoformat(d) for d in days}
+        for exchange, days in holidays.items()
+    }
+
+
+HOLIDAYS = _load_holidays()
+
+
+# Index symbols follow their exchange's session
+INDEX_EXCHANGES = {
+    "^NSEI": "NSE",
+    "^BSESN": "BSE",
+}
+
+
+def exchange_for_symbol(symbol: str) -> Optional[str]:
+    """NSE for .NS and NIFTY 50, BSE for .BO and SENSEX, MCX for commodity symbols, None otherwise"""
+    from tools.commodity_price_tool import COMMODITY_MAP
+
+    symbol = (symbol or "").upper()
+    if symbol in INDEX_EXCHANGES:
+        return INDEX_EXCHANGES[symbol]
+    if symbol.endswith(".NS"):
+        return "NSE"
+    if symbol.endswith(".BO"):
+        return "BSE"
+    if symbol in COMMODITY_MAP.values():
+        return "MCX"
+    return None
+
+
+def _now(now: Optional[datetime]) -> datetime:
+    if now is None:
+        return datetime.now(IST)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=IST)
+    return now.astimezone(IST)
+
+
+def is_trading_day(exchange: str, day: date) -> bool:
+    return day.weekday() < 5 and day not in HOLIDAYS.get(exchange, set())
+
+
+def session_bounds(exchange: str, day: date):
+    """(open, close) datetimes in IST for `day`"""
+    open_t, close_t = SESSIONS[exchange]
+    return datetime.combine(day, open_t, IST), datetime.combine(day, close_t, IST)
+
+
+def is_session_active(exchange: str, now: Optional[datetime] = None) -> bool:
+    """Session is open, or closed less than SETTLE_MINUTES ago"""
+    now = _now(now)
+    # yesterday too: a late close (MCX) can still be settling after midnight
+    for day in (now.date(), now.date() - timedelta(days=1)):
+        if not is_trading_day(exchange, day):
+            continue
+        open_dt, close_dt = session_bounds(exchange, day)
+        if open_dt <= now < close_dt + timedelta(minutes=SETTLE_MINUTES):
+            return True
+    return False
+
+
+def last_session_close(exchange: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Close of the most recent session that has fully settled as of `now`"""
+    now = _now(now)
+    day = now.date()
+    for _ in range(30):
+        if is_trading_day(exchange, day):
+            _, close_dt = session_bounds(exchange, day)
+            if close_dt + timedelta(minutes=SETTLE_MINUTES) <= now:
+                return close_dt
+        day -= timedelta(days=1)
+    return None
+
+
+def sessions_since(exchange: str, day: date, now: Optional[datetime] = None) -> int:
+    """Settled sessions after `day` as of `now` (0 when `day` is the latest one)"""
+    close_dt = last_session_close(exchange, now)
+    if close_dt is None:
+        return 0
+    count, d = 0, close_dt.date()
+    while d > day:
+        count += is_trading_day(exchange, d)
+        d -= timedelta(days=1)
+    return count
+
+
+def is_bar_final(exchange: str, bar_time: datetime, fetched_at: datetime) -> bool:
+    """Was the daily bar for `bar_time`'s session fetched after that session settled?"""
+    _, close_dt = session_bounds(exchange, _now(bar_time).date())
+    return _now(fetched_at) >= close_dt + timedelta(minutes=SETTLE_MINUTES)
+
+
+def is_cache_current(exchange: str, fetched_at: float, now: Optional[datetime] = None) -> bool:
+    """
+    True when data fetched at `fetched_at` (epoch seconds) cannot be stale:
+    the market is closed and no session has settled since the fetch.
+    """
+    if exchange not in SESSIONS or not fetched_at:
+        return False
+
+    now = _now(now)
+    if is_session_active(exchange, now):
+        return False
+
+    close_dt = last_session_close(exchange, now)
+    if close_dt is None:
+        return False
+    return datetime.fromtimestamp(fetched_at, IST) >= close_dt + timedelta(minutes=SETTLE_MINUTES)
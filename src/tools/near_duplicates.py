@@ -0,0 +1,85 @@
+# src/tools/near_duplicates.py
+"""
+Near-duplicate grouping for news text (MinHash over word shingles).
+
+Wire stories are syndicated by several outlets with small edits to the
+headline or blurb. Grouping them before inference means each story is
+scored once and counted once in the sentiment average.
+"""
+
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+from tools.sentiment_cache import normalize_text
+
+SHINGLE_SIZE = 3        # words per shingle
+NUM_PERM = 64           # MinHash permutations
+BANDS = 16              # LSH bands (NUM_PERM / BANDS rows each)
+DUPLICATE_THRESHOLD = 0.6   # estimated Jaccard similarity to merge two texts
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Hashed word n-grams of the normalized text (the whole text if shorter)"""
+    words = _WORD.findall(normalize_text(text))
+    if len(words) < size:
+        grams = [" ".join(words)]
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return {zlib.crc32(g.encode("utf-8")) & _PRIME for g in grams}
+
+
+def minhash(text: str) -> np.ndarray:
+    """NUM_PERM-value signature; equal positions estimate Jaccard similarity"""
+    values = np.fromiter(shingles(text), dtype=np.uint64)
+    hashed = (values[:, None] * _A[None, :] + _B[None, :]) % _PRIME
+    return hashed.min(axis=0)
+
+
+def group_near_duplicates(texts: List[str], threshold: float = DUPLICATE_THRESHOLD) -> List[List[int]]:
+    """
+    Group indices of near-duplicate texts.
+
+    Candidates come from LSH banding of the signatures and are merged when
+    their estimated similarity reaches `threshold`.
+
+    Returns:
+        groups of indices into `texts`, in order of first appearance; the
+        first index of each group is its representative
+    """
+    if not texts:
+        return []
+
+    signatures = np.vstack([minhash(t) for t in texts])
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = NUM_PERM // BANDS
+    for band in range(BANDS):
+        buckets = {}
+        for i, sig in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            buckets.setdefault(sig.tobytes(), []).append(i)
+        for members in buckets.values():
+            for j in members[1:]:
+                a, b = find(members[0]), find(j)
+                if a != b and (signatures[members[0]] == signatures[j]).mean() >= threshold:
+                    parent[max(a, b)] = min(a, b)
+
+    groups = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
@@ -0,0 +1,166 @@
+# src/tools/news_cache.py
+"""
+Persistent NewsAPI response cache with a daily request budget.
+
+Responses are keyed by query + request parameters and served
+stale-while-revalidate: a fresh entry (younger than NEWS_FRESH_SECONDS) is
+returned as is, a stale one is returned immediately while a background
+thread refreshes it. Every real request spends one unit of
+NEWS_DAILY_BUDGET (UTC day); once it is spent, stale entries keep being
+served and queries with nothing cached get no articles instead of an error.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from utils.diagnostics import diag
+
+NEWS_CACHE_PATH = os.getenv(
+    "NEWS_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), "stock_cache", "news.sqlite")
+)
+# Age after which a cached response is refreshed in the background
+NEWS_FRESH_SECONDS = int(os.getenv("NEWS_FRESH_SECONDS", "1800"))
+# NewsAPI developer plan: 100 requests per day
+NEWS_DAILY_BUDGET = int(os.getenv("NEWS_DAILY_BUDGET", "100"))
+
+EMPTY_RESPONSE = {"status": "ok", "totalResults": 0, "articles": []}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS news_budget (
+    day TEXT PRIMARY KEY,
+    used INTEGER NOT NULL
+);
+"""
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class NewsCache:
+    def __init__(self, path: str = NEWS_CACHE_PATH, fresh_seconds: int = NEWS_FRESH_SECONDS,
+                 daily_budget: int = NEWS_DAILY_BUDGET):
+        """
+        Args:
+            path: SQLite file for responses and budget counters
+            fresh_seconds: age after which an entry is revalidated
+            daily_budget: real NewsAPI requests allowed per UTC day
+        """
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self.daily_budget = daily_budget
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(query: str, **params) -> str:
+        return json.dumps({"q": query.strip().lower(), **params}, sort_keys=True)
+
+    # --------------------------------------------------
+    # STORAGE
+    # --------------------------------------------------
+    def get(self, key: str) -> Optional[tuple]:
+        """(response, fetched_at) or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, fetched_at FROM news_responses WHERE key=?", (key,)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put(self, key: str, response: dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO news_responses VALUES (?, ?, ?)",
+                (key, json.dumps(response), time.time())
+            )
+
+    # --------------------------------------------------
+    # BUDGET
+    # --------------------------------------------------
+    def try_spend(self) -> bool:
+        """Take one request from today's budget; False once it is used up"""
+        day = _today()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO news_budget VALUES (?, 0)", (day,))
+            spent = self._conn.execute(
+                "UPDATE news_budget SET used = used + 1 WHERE day=? AND used < ?",
+                (day, self.daily_budget)
+            ).rowcount
+        return spent == 1
+
+    def budget_used(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT used FROM news_budget WHERE day=?", (_today(),)).fetchone()
+        return row[0] if row else 0
+
+    # --------------------------------------------------
+    # STALE-WHILE-REVALIDATE
+    # --------------------------------------------------
+    def _fetch(self, key: str, fetch: Callable[[], dict]) -> Optional[dict]:
+        """One real request if the budget allows; None when skipped or failed"""
+        if not self.try_spend():
+            return None
+        try:
+            response = fetch()
+        except Exception as e:
+            err = str(e) or type(e).__name__
+            diag("news.request_failed", lambda: {"key": key, "error": err}, level="WARNING")
+            return None
+        self.put(key, response)
+        return response
+
+    def _refresh(self, key: str, fetch: Callable[[], dict]):
+        try:
+            self._fetch(key, fetch)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], dict]) -> dict:
+        """
+        Cached response for `key`, calling `fetch()` only when needed:
+        synchronously if nothing is cached, in the background if stale.
+        """
+        cached = self.get(key)
+        if cached is None:
+            return self._fetch(key, fetch) or EMPTY_RESPONSE
+
+        response, fetched_at = cached
+        if time.time() - fetched_at >= self.fresh_seconds:
+            with self._lock:
+                start = key not in self._refreshing
+                self._refreshing.add(key)
+            if start:
+                threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+        return response
+
+
+# Convenience accessor
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_news_cache() -> NewsCache:
+    global _cache_instance
+
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = NewsCache()
+
+    return _cache_instance
@@ -1,30 +1,117 @@
-from newsapi import NewsApiClient
-from transformers import pipeline
 import os
+import threading
+from typing import Dict, List
 from dotenv import load_dotenv
+
+from tools.near_duplicates import group_near_duplicates
+from tools.news_cache import get_news_cache
+from tools.sentiment_model import backend_cache_id
+from tools.sentiment_cache import get_sentiment_cache
+from tools.sentiment_service import get_sentiment_service
+from utils.diagnostics import diag
+
 load_dotenv()
-print(os.getenv("NEWS_API_KEY"))
-newsapi = NewsApiClient(api_key=os.getenv("NEWS_API_KEY"))
-finbert = pipeline("sentiment-analysis", model="ProsusAI/finbert")
+
+LABEL_VALUES = {"POSITIVE": 1, "NEGATIVE": -1, "NEUTRAL": 0}
+
+_newsapi = None
+_newsapi_lock = threading.Lock()
+
+
+def get_newsapi():
+    """Shared NewsApiClient, built on first use"""
+    global _newsapi
+
+    if _newsapi is None:
+        with _newsapi_lock:
+            if _newsapi is None:
+                from newsapi import NewsApiClient
+                _newsapi = NewsApiClient(api_key=os.getenv("NEWS_API_KEY"))
+
+    return _newsapi
+
+
+def search_news(query: str, language: str = "en", page_size: int = 5) -> dict:
+    """
+    NewsAPI get_everything through the persistent response cache: stale
+    results are served instantly (and refreshed in the background), and
+    nothing is requested once the daily budget is spent.
+    """
+    cache = get_news_cache()
+    key = cache.key(query, language=language, page_size=page_size)
+    return cache.get_or_fetch(
+        key,
+        lambda: get_newsapi().get_everything(q=query, language=language, page_size=page_size)
+    )
+
+
+def score_texts(texts: List[str]) -> List[Dict]:
+    """
+    Score many texts with FinBERT in batched forward passes.
+    Shared by news headlines, social posts and commodity news.
+
+    Texts already seen (same normalized content) are served from the
+    sentiment cache; only the rest go through the shared micro-batching
+    service, where they share forward passes with other sessions' texts.
+
+    Returns:
+        [{"label": "positive"|"negative"|"neutral", "score": float}] in input order
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    cache = get_sentiment_cache()
+    keys = [cache.key(t, backend_cache_id()) for t in texts]
+    scores = cache.get_many(keys)
+
+    missing = list(dict.fromkeys(k for k in keys if k not in scores))
+    if missing:
+        by_key = dict(zip(keys, texts))
+        results = get_sentiment_service().score([by_key[k] for k in missing])
+
+        fresh = dict(zip(missing, results))
+        cache.put_many(fresh)
+        scores.update(fresh)
+
+    # this call's hits plus the process-wide hit rate and model time saved
+    diag("sentiment.cache", lambda: {
+        "texts": len(keys),
+        "inferred": len(missing),
+        **cache.stats(),
+    }, level="INFO")
+    return [dict(scores[k]) for k in keys]
+
+
+def article_text(art: dict) -> str:
+    return (art.get("title") or "") + ". " + (art.get("description") or "")
+
 
 def get_sentiment(company_name: str):
-    articles = newsapi.get_everything(q=company_name, language="en", page_size=5)
+    articles = search_news(company_name, language="en", page_size=5)
     if not articles["articles"]:
         return {"sentiment": 0, "articles": []}
 
+    # syndicated copies of one wire story are scored once and counted once
+    texts = [article_text(art) for art in articles["articles"]]
+    groups = group_near_duplicates(texts)
+
+    # one batched call for the group representatives
+    scores = score_texts([texts[g[0]] for g in groups])
+
     sentiments = []
     summarized = []
-    for art in articles["articles"]:
-        text = (art["title"] or "") + ". " + (art["description"] or "")
-        s = finbert(text[:512])[0]  # label: POSITIVE/NEGATIVE/NEUTRAL
-        label = s["label"].upper()
-        val = {"POSITIVE": 1, "NEGATIVE": -1, "NEUTRAL": 0}[label]
-        sentiments.append(val)
-        summarized.append({
-            "source": art["source"]["name"],
-            "title": art["title"],
-            "sentiment": s["label"]
-        })
+    for group, s in zip(groups, scores):
+        label = s["label"].upper()  # label: POSITIVE/NEGATIVE/NEUTRAL
+        sentiments.append(LABEL_VALUES[label])
+        for i in group:
+            art = articles["articles"][i]
+            summarized.append({
+                "source": art["source"]["name"],
+                "title": art["title"],
+                "sentiment": s["label"],
+                "duplicates": len(group) - 1
+            })
     avg_sentiment = sum(sentiments) / len(sentiments)
     return {"sentiment": avg_sentiment, "articles": summarized}
-# print(get_sentiment(company_name="Infosys"))
\ No newline at end of file
+# print(get_sentiment(company_name="Infosys"))
@@ -1,5 +1,9 @@
-from tools.price_tool import get_price_data
-from risk.risk_engine import compute_risk_score
+import numpy as np
+
+from tools.price_tool import get_price_data_batch
+from risk.risk_engine import score_contexts
+from risk.portfolio_risk import portfolio_risk
+from tools.covariance_store import get_covariance_store
 
 def analyze_portfolio(portfolio: dict):
     """
@@ -17,15 +21,20 @@ def analyze_portfolio(portfolio: dict):
     """
 
     results = []
+    contexts = []
     total_value = 0.0
 
+    prices = get_price_data_batch([pos["ticker"] for pos in portfolio["positions"]])
+
     # First pass: compute values
     for pos in portfolio["positions"]:
         ticker = pos["ticker"]
         qty = pos["quantity"]
         buy_price = pos["buy_price"]
 
-        price_data = get_price_data(ticker)
+        price_data = prices.get(ticker)
+        if price_data is None:
+            raise ValueError(f"No price data for {ticker}")
 
         # price_data is a dict (latest candle)
         current_price = float(price_data["Close"])
@@ -35,15 +44,13 @@ def analyze_portfolio(portfolio: dict):
         pnl = current_value - invested_value
         pnl_pct = (pnl / invested_value) * 100 if invested_value else 0.0
 
-        context = {
+        contexts.append({
             "stock": pos["stock"],
             "ticker": ticker,
             "price_data": price_data,
             "fundamentals": {},   # you can plug real fundamentals later
             "sentiment": {}       # and real sentiment later
-        }
-
-        risk = compute_risk_score(context)
+        })
 
         results.append({
             "stock": pos["stock"],
@@ -55,7 +62,6 @@ def analyze_portfolio(portfolio: dict):
             "current_value": round(current_value, 2),
             "pnl": round(pnl, 2),
             "pnl_pct": round(pnl_pct, 2),
-            "risk": risk,
             "technicals": {
                 "RSI": price_data.get("RSI"),
                 "MACD": price_data.get("MACD"),
@@ -67,11 +73,63 @@ def analyze_portfolio(portfolio: dict):
 
         total_value += current_value
 
-    # Second pass: compute weights
-    for r in results:
+    # Second pass: risk for all positions in one vectorized call, then weights
+    for r, risk in zip(results, score_contexts(contexts)):
+        r["risk"] = risk
         r["weight_pct"] = round((r["current_value"] / total_value) * 100, 2) if total_value else 0.0
 
+    # Portfolio-level VaR / ES (historical, parametric, Monte Carlo)
+    position_values = {}
+    for r in results:
+        position_values[r["ticker"]] = position_values.get(r["ticker"], 0.0) + r["current_value"]
+    try:
+        risk_metrics = portfolio_risk(position_values)
+    except Exception as e:
+        risk_metrics = {"error": str(e)}
+
+    # EWMA volatility / correlation from the shared covariance store
+    try:
+        risk_metrics["ewma"] = ewma_exposure(position_values, results)
+    except Exception as e:
+        risk_metrics["ewma"] = {"error": str(e)}
+
     return {
         "total_value": round(total_value, 2),
-        "positions": results
+        "positions": results,
+        "risk_metrics": risk_metrics
+    }
+
+
+def ewma_exposure(position_values: dict, results: list) -> dict:
+    """
+    Annualized EWMA volatility of each holding and of the whole portfolio,
+    plus each holding's correlation with the portfolio; fills
+    `volatility_pct` / `correlation_to_portfolio` on the position rows.
+    """
+    tickers = list(position_values)
+    cov = get_covariance_store().covariance(tickers, annualize=True).to_numpy()
+    values = np.array([position_values[t] for t in tickers], dtype=float)
+    weights = values / values.sum()
+
+    known = ~np.isnan(np.diag(cov))
+    cov = np.where(np.outer(known, known), cov, 0.0)
+    vols = np.sqrt(np.diag(cov))
+    port_vol = float(np.sqrt(weights @ cov @ weights))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_portfolio = (cov @ weights) / (vols * port_vol)
+
+    by_ticker = {
+        t: {
+            "volatility_pct": round(float(vols[i]) * 100, 2) if known[i] else None,
+            "correlation_to_portfolio": round(float(to_portfolio[i]), 3) if known[i] and port_vol else None,
+        }
+        for i, t in enumerate(tickers)
+    }
+    for r in results:
+        r.update(by_ticker[r["ticker"]])
+
+    return {
+        "volatility_pct": round(port_vol * 100, 2),
+        "missing": [t for t, k in zip(tickers, known) if not k],
     }
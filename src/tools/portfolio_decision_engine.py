@@ -1,4 +1,17 @@
-def decide_position_action(pos):
+import math
+
+from tools.covariance_store import get_covariance_store
+
+CORRELATION_WARN = 0.8
+
+
+def decide_position_action(pos, portfolio_tickers=None):
+    """
+    Args:
+        pos: a position row from analyze_portfolio
+        portfolio_tickers: the other holdings; when given, highly correlated
+                           ones (EWMA correlation > CORRELATION_WARN) are listed
+    """
     tech = pos["technicals"]
     risk = pos["risk"]
 
@@ -36,6 +49,22 @@ def decide_position_action(pos):
     if weight > 40:
         action = "TRIM POSITION"
     
+    # Volatility and overlap with the rest of the portfolio (EWMA covariance store)
+    volatility_pct = pos.get("volatility_pct")
+    correlated_with = []
+    if portfolio_tickers:
+        others = [t for t in dict.fromkeys(portfolio_tickers) if t != pos["ticker"]]
+        if others:
+            corr = get_covariance_store().correlation([pos["ticker"]] + others).iloc[0, 1:]
+            correlated_with = [
+                {"ticker": t, "correlation": round(float(c), 2)}
+                for t, c in corr.sort_values(ascending=False).items()
+                if c > CORRELATION_WARN
+            ]
+    if volatility_pct is None and portfolio_tickers is not None:
+        vol = get_covariance_store().volatility([pos["ticker"]], refresh=False).iloc[0]
+        volatility_pct = None if math.isnan(vol) else round(float(vol) * 100, 2)
+
     # Stop-loss suggestion (ATR based)
     stop_loss = round(current_price - 2 * atr, 2) if atr else None
 
@@ -44,5 +73,7 @@ def decide_position_action(pos):
         "trend_phase": trend_phase,
         "holding_horizon": holding_horizon,
         "suggested_stop_loss": stop_loss,
-        "risk_score": risk_score
+        "risk_score": risk_score,
+        "volatility_pct": volatility_pct,
+        "correlated_with": correlated_with
     }
@@ -1,17 +1,260 @@
+import os
+import time
+
 import yfinance as yf
-import pandas_ta as ta
 import pandas as pd
 
+from tools.bar_store import get_bar_store, to_epoch
+from tools.indicator_state import IndicatorState, states_from_arrays
+from tools.market_calendar import exchange_for_symbol, is_cache_current
+from utils.diagnostics import diag
+
+# While a session is live, bars fetched less than this many seconds ago are
+# served without a network call (after the close see market_calendar)
+BAR_REFRESH_SECONDS = int(os.getenv("BAR_REFRESH_SECONDS", "60"))
+
+_PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+def _period_start(period: str, now: pd.Timestamp) -> pd.Timestamp:
+    """Translate a yfinance period string into the first timestamp it covers"""
+    if period == "max":
+        return pd.Timestamp(0, tz="UTC")
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    if period not in _PERIOD_OFFSETS:
+        raise ValueError(f"Unsupported period: {period}")
+    return (now - _PERIOD_OFFSETS[period]).normalize()
+
+
+def _fetch_mode(meta, start: pd.Timestamp, exchange=None):
+    """'full', 'delta' or None (stored bars are fresh enough)"""
+    covered = (
+        meta is not None
+        and meta["last_ts"] is not None
+        and meta["covered_from"] is not None
+        and meta["covered_from"] <= start.timestamp()
+    )
+    if not covered:
+        return "full"
+    if exchange and is_cache_current(exchange, meta["last_fetch"]):
+        # fetched after the last session settled: nothing new until the next open
+        return None
+    if time.time() - (meta["last_fetch"] or 0) >= BAR_REFRESH_SECONDS:
+        return "delta"
+    return None
+
+
+def _has_corporate_action(df: pd.DataFrame, since: pd.Timestamp) -> bool:
+    """A split or dividend on a new bar re-adjusts the whole (auto-adjusted) history"""
+    new = df[df.index > since]
+    return any(
+        col in new and (new[col].fillna(0) != 0).any()
+        for col in ("Stock Splits", "Dividends")
+    )
+
+
+def _download(tickers: list, interval: str, period=None, start=None) -> dict:
+    """One grouped yf.download call, split back into per-ticker history() frames"""
+    raw = yf.download(
+        tickers,
+        period=period,
+        start=start,
+        interval=interval,
+        group_by="ticker",
+        auto_adjust=True,
+        actions=True,
+        ignore_tz=False,
+        threads=True,
+        progress=False,
+    )
+    if raw is None or raw.empty:
+        return {}
+
+    frames = {}
+    for ticker in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            df = raw[ticker]
+        else:
+            df = raw
+        df = df.dropna(how="all", subset=[c for c in ("Open", "High", "Low", "Close") if c in df])
+        if not df.empty:
+            frames[ticker] = df
+    return frames
+
+
+def load_history_batch(tickers: list, period="6mo", interval="1d") -> dict:
+    """
+    Like load_history for many tickers. All stale symbols are refreshed with
+    at most two grouped downloads (one full, one delta) instead of one
+    request per ticker.
+    """
+    store = get_bar_store()
+    now = pd.Timestamp.now(tz="UTC")
+    start = _period_start(period, now)
+
+    full, delta = [], {}
+    for ticker in dict.fromkeys(tickers):
+        meta = store.get_meta(ticker, interval)
+        mode = _fetch_mode(meta, start, exchange_for_symbol(ticker))
+        if mode == "full":
+            full.append(ticker)
+        elif mode == "delta":
+            delta[ticker] = meta["last_ts"]
+
+    if delta:
+        # Start at the oldest "last bar" so every symbol gets its partial bar replaced
+        since = pd.Timestamp(min(delta.values()), unit="s", tz="UTC")
+        for ticker, df in _download(list(delta), interval, start=since.to_pydatetime()).items():
+            if _has_corporate_action(df, pd.Timestamp(delta[ticker], unit="s", tz="UTC")):
+                store.clear(ticker, interval)
+                full.append(ticker)
+            else:
+                store.upsert(ticker, interval, df)
+
+    if full:
+        for ticker, df in _download(full, interval, period=period).items():
+            store.upsert(ticker, interval, df, covered_from=start)
+
+    return {t: store.load(t, interval, start=start) for t in tickers}
+
+
+def load_history(ticker: str, period="6mo", interval="1d", exchange=None) -> pd.DataFrame:
+    """
+    OHLCV history for `period`, served from the local bar store.
+    Only bars newer than the last stored one are downloaded, and none at all
+    once the exchange session has closed and the store was refreshed after it.
+
+    Args:
+        exchange: calendar to use (NSE/BSE/MCX); guessed from the symbol if omitted
+    """
+    store = get_bar_store()
+    now = pd.Timestamp.now(tz="UTC")
+    start = _period_start(period, now)
+    meta = store.get_meta(ticker, interval)
+    mode = _fetch_mode(meta, start, exchange or exchange_for_symbol(ticker))
+
+    if mode == "delta":
+        # Delta fetch; starts at the last stored bar so a partial bar gets replaced
+        last = pd.Timestamp(meta["last_ts"], unit="s", tz="UTC")
+        df = yf.Ticker(ticker).history(start=last.to_pydatetime(), interval=interval)
+        if _has_corporate_action(df, last):
+            store.clear(ticker, interval)
+            mode = "full"
+        else:
+            store.upsert(ticker, interval, df)
+
+    if mode == "full":
+        # Nothing stored (or not far enough back): one full download
+        df = yf.Ticker(ticker).history(period=period, interval=interval)
+        if not df.empty:
+            store.upsert(ticker, interval, df, covered_from=start)
+
+    return store.load(ticker, interval, start=start)
+
+
+INDICATOR_COLUMNS = ["RSI", "MACD", "EMA10", "EMA50", "ATR"]
+
+
+def _latest_indicators(frames: dict, interval: str) -> dict:
+    """
+    Latest indicator row per ticker.
+
+    Indicators come from an IndicatorState saved as of the second-to-last
+    stored bar: only the bars after it are stepped through (usually one or
+    two), and the last bar, which may still be a partial session, is applied
+    to a copy. Tickers without a usable state are seeded from their history
+    in one vectorized panel pass.
+    """
+    store = get_bar_store()
+    saved = store.load_states(list(frames), interval)
+
+    bars, states, cold = {}, {}, []
+    for ticker, df in frames.items():
+        ts = to_epoch(df.index)
+        bars[ticker] = (ts, df["High"].to_numpy(), df["Low"].to_numpy(), df["Close"].to_numpy())
+
+        state = saved.get(ticker)
+        pos = ts.index(state["ts"]) + 1 if state and state["ts"] in ts[:-1] else None
+        if pos is None:
+            cold.append(ticker)
+        else:
+            states[ticker] = (IndicatorState.from_dict(state), pos)
+
+    if cold:
+        history = {t: frames[t].iloc[:-1] for t in cold}
+        seeded = states_from_arrays(
+            pd.concat({t: df["Close"] for t, df in history.items()}, axis=1).to_numpy(),
+            pd.concat({t: df["High"] for t, df in history.items()}, axis=1).to_numpy(),
+            pd.concat({t: df["Low"] for t, df in history.items()}, axis=1).to_numpy(),
+            ts=[bars[t][0][-2] if len(bars[t][0]) > 1 else None for t in cold],
+        )
+        for ticker, state in zip(cold, seeded):
+            states[ticker] = (state, len(frames[ticker]) - 1)
+
+    rows, updated = {}, {}
+    for ticker, (state, pos) in states.items():
+        ts, high, low, close = bars[ticker]
+        for i in range(pos, len(ts) - 1):
+            state.update(high[i], low[i], close[i], ts=ts[i])
+        updated[ticker] = state.to_dict()
+
+        values = state.copy().update(high[-1], low[-1], close[-1])
+        row = frames[ticker].tail(1).to_dict("records")[0]
+        row.update({name: values[name] for name in INDICATOR_COLUMNS})
+        rows[ticker] = row
+
+    store.save_states(interval, updated)
+    return rows
+
+
 def get_price_data(ticker: str, period="6mo", interval="1d"):
-    t = yf.Ticker(ticker)
-    df = t.history(period=period, interval=interval)
+    df = load_history(ticker, period=period, interval=interval)
     if df.empty:
         raise ValueError(f"No price data for {ticker}")
-    df["RSI"] = ta.rsi(df["Close"], length=14)
-    macd = ta.macd(df["Close"])
-    df["MACD"] = macd["MACD_12_26_9"]
-    df["EMA10"] = ta.ema(df["Close"], length=10)
-    df["EMA50"] = ta.ema(df["Close"], length=50)
-    df["ATR"] = ta.atr(df["High"], df["Low"], df["Close"], length=14)
-    return df.tail(1).to_dict("records")[0]   # latest indicators
+    return _latest_indicators({ticker: df}, interval)[ticker]   # latest indicators
+
+
+def get_price_data_batch(tickers: list, period="6mo", interval="1d") -> dict:
+    """
+    Latest indicator row for every ticker, fetched with one grouped download.
+    If the grouped download fails, each ticker is fetched on its own so one
+    bad symbol (or a flaky batch request) can't sink the rest.
+
+    Returns:
+        {ticker: row} in the same shape as get_price_data(); tickers without
+        price data are left out.
+    """
+    try:
+        frames = {
+            ticker: df
+            for ticker, df in load_history_batch(tickers, period=period, interval=interval).items()
+            if not df.empty
+        }
+        if not frames:
+            return {}
+        return _latest_indicators(frames, interval)
+    except Exception as e:
+        err = str(e) or type(e).__name__
+        diag("price.batch_failed", lambda: {"tickers": len(tickers), "error": err}, level="INFO")
+
+    rows = {}
+    for ticker in dict.fromkeys(tickers):
+        try:
+            rows[ticker] = get_price_data(ticker, period=period, interval=interval)
+        except Exception:
+            continue
+    return rows
 # print(get_price_data(ticker="INFY.NS"))
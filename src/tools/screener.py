@@ -1,8 +1,8 @@
 # src/tools/screener.py
 
-from tools.price_tool import get_price_data
+from tools.price_tool import get_price_data_batch
 from tools.fundamentals_tool import get_fundamentals
-from risk.risk_engine import compute_risk_score
+from risk.risk_engine import score_contexts
 
 WATCHLIST = [
     "INFY.NS", "TCS.NS", "HDFCBANK.NS", "ICICIBANK.NS", "RELIANCE.NS",
@@ -14,26 +14,34 @@ def run_screener(slots):
     horizon = slots.get("investment_horizon")
     sector = slots.get("sector")
 
-    candidates = []
+    contexts = []
+
+    # one grouped download for the whole watchlist
+    prices = get_price_data_batch(WATCHLIST)
 
     for ticker in WATCHLIST:
+        price = prices.get(ticker)
+        if price is None:
+            continue
+
         try:
-            price = get_price_data(ticker)
             fundamentals = get_fundamentals(ticker)
-
-            ctx = {
-                "ticker": ticker,
-                "price_data": price,
-                "fundamentals": fundamentals,
-                "sentiment": {"sentiment": 0, "articles": []}  # keep light for now
-            }
-
-            risk = compute_risk_score(ctx)
-            candidates.append({"ticker": ticker, "risk": risk})
-
         except Exception:
             continue
 
+        contexts.append({
+            "ticker": ticker,
+            "price_data": price,
+            "fundamentals": fundamentals,
+            "sentiment": {"sentiment": 0, "articles": []}  # keep light for now
+        })
+
+    # score the whole watchlist in one vectorized pass
+    candidates = [
+        {"ticker": ctx["ticker"], "risk": risk}
+        for ctx, risk in zip(contexts, score_contexts(contexts))
+    ]
+
     # sort by lowest risk
     ranked = sorted(candidates, key=lambda x: x["risk"]["risk_score"])
     print(ranked)
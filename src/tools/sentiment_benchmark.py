@@ -0,0 +1,118 @@
+# src/tools/sentiment_benchmark.py
+"""
+Compare sentiment backends against the stock transformers pipeline:
+label agreement, latency (ms per text) and peak RSS.
+
+Each backend runs in its own process so RSS numbers do not mix.
+
+Usage (from src/):
+    python -m tools.sentiment_benchmark --backends transformers int8 onnx
+    python -m tools.sentiment_benchmark --texts headlines.txt --repeat 5
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import sys
+import time
+from typing import Dict, List
+
+from tools.sentiment_model import BACKENDS, load_backend
+
+SAMPLE_HEADLINES = [
+    "Infosys raises FY guidance after strong deal wins",
+    "TCS shares slip as margins contract in the September quarter",
+    "HDFC Bank reports steady loan growth, asset quality stable",
+    "Reliance Industries announces record capex plan for green energy",
+    "SEBI probe weighs on Adani group stocks",
+    "ITC hotel demerger to unlock value, say analysts",
+    "Crude oil prices surge on Middle East supply fears",
+    "Gold hits all-time high as investors seek safe havens",
+    "Axis Bank net profit falls 8% on higher provisions",
+    "Tata Motors JLR volumes recover, EV push continues",
+    "Rupee weakens past 84 per dollar on FII outflows",
+    "SBI cuts lending rates by 10 basis points",
+    "Wipro loses major client contract in Europe",
+    "L&T bags order worth over Rs 7,000 crore",
+    "Hindustan Unilever volume growth flat amid rural slowdown",
+    "Sun Pharma gets USFDA warning letter for Halol plant",
+]
+
+
+def _peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run_backend(name: str, texts: List[str], batch_size: int, max_length: int, repeat: int, out):
+    try:
+        started = time.perf_counter()
+        backend = load_backend(name)
+        load_s = time.perf_counter() - started
+
+        backend.predict(texts[:batch_size], batch_size=batch_size, max_length=max_length)  # warm-up
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            preds = backend.predict(texts, batch_size=batch_size, max_length=max_length)
+        elapsed = time.perf_counter() - started
+
+        out.put({
+            "backend": name,
+            "labels": [p["label"].lower() for p in preds],
+            "load_s": round(load_s, 2),
+            "ms_per_text": round(1000 * elapsed / (repeat * len(texts)), 2),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        })
+    except Exception as e:
+        out.put({"backend": name, "error": f"{type(e).__name__}: {e}"})
+
+
+def benchmark_backends(backends: List[str], texts: List[str], batch_size: int = 16,
+                       max_length: int = 512, repeat: int = 3) -> List[Dict]:
+    """One row per backend; `agreement` is the share of labels equal to the transformers baseline"""
+    ctx = mp.get_context("spawn")
+    results = []
+    for name in backends:
+        out = ctx.Queue()
+        proc = ctx.Process(target=_run_backend, args=(name, texts, batch_size, max_length, repeat, out))
+        proc.start()
+        results.append(out.get())
+        proc.join()
+
+    baseline = next((r for r in results if r.get("backend") == "transformers" and "labels" in r), None)
+    for r in results:
+        if baseline and "labels" in r:
+            same = sum(a == b for a, b in zip(r["labels"], baseline["labels"]))
+            r["agreement"] = round(same / len(texts), 3)
+        r.pop("labels", None)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark FinBERT sentiment backends")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--texts", help="file with one text per line (default: built-in headlines)")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.texts:
+        with open(args.texts, "r", encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = SAMPLE_HEADLINES
+
+    backends = args.backends
+    if "transformers" in backends:
+        # baseline first so agreement is always against it
+        backends = ["transformers"] + [b for b in backends if b != "transformers"]
+
+    print(f"{'backend':<14}{'agree':>8}{'ms/text':>10}{'load s':>9}{'peak RSS MB':>13}")
+    for r in benchmark_backends(backends, texts, batch_size=args.batch_size, repeat=args.repeat):
+        if "error" in r:
+            print(f"{r['backend']:<14}  error: {r['error']}")
+            continue
+        print(f"{r['backend']:<14}{r.get('agreement', float('nan')):>8}{r['ms_per_text']:>10}"
+              f"{r['load_s']:>9}{r['peak_rss_mb']:>13}")
@@ -0,0 +1,120 @@
+# src/tools/sentiment_cache.py
+"""
+Content-addressed sentiment cache.
+
+Scores are keyed by a hash of the model id and the normalized text, so the
+same headline (or post) coming back from NewsAPI all day is scored once.
+Hit/miss counts and the inference time saved are kept as process metrics
+and published with every score_texts call (diag event "sentiment.cache").
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, List
+
+SENTIMENT_CACHE_PATH = os.getenv(
+    "SENTIMENT_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), "stock_cache", "sentiment.sqlite")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentiment_cache (
+    key TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    score REAL NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Case/width/whitespace-insensitive form used for hashing"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class SentimentCache:
+    def __init__(self, path: str = SENTIMENT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        # metrics
+        self.hits = 0
+        self.misses = 0
+        self.inference_seconds = 0.0
+        self.inferred_texts = 0
+
+    @staticmethod
+    def key(text: str, model: str) -> str:
+        return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """{key: {"label", "score"}} for the keys that are cached"""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, label, score FROM sentiment_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+            found.update({k: {"label": label, "score": score} for k, label, score in rows})
+
+        with self._lock:
+            hits = sum(1 for k in keys if k in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items: Dict[str, Dict]):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?, ?)",
+                [(k, v["label"], float(v["score"]), now) for k, v in items.items()]
+            )
+
+    def record_inference(self, n_texts: int, seconds: float):
+        with self._lock:
+            self.inferred_texts += n_texts
+            self.inference_seconds += seconds
+
+    def stats(self) -> dict:
+        """Hit rate and the model time saved by cache hits (estimated from the average cost per text)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            per_text = self.inference_seconds / self.inferred_texts if self.inferred_texts else 0.0
+            return {
+                "lookups": lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "inference_seconds": round(self.inference_seconds, 3),
+                "saved_seconds": round(self.hits * per_text, 3),
+            }
+
+
+# Convenience accessor
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_sentiment_cache() -> SentimentCache:
+    global _cache_instance
+
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = SentimentCache()
+
+    return _cache_instance
+
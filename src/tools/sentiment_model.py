@@ -0,0 +1,140 @@
+# src/tools/sentiment_model.py
+"""
+Process-wide, lazily loaded FinBERT with pluggable inference backends.
+
+Nothing heavy happens at import: the selected backend (and transformers /
+torch / onnxruntime) is loaded on the first get_finbert() call
+(thread-safe, exactly once), so code paths that never score sentiment
+never pay for the model.
+
+Backends (SENTIMENT_BACKEND):
+    transformers  the stock torch pipeline (default)
+    int8          torch dynamic INT8 quantization of the Linear layers
+    onnx          ONNX Runtime via optimum (pip install optimum[onnxruntime])
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+FINBERT_MODEL = os.getenv("FINBERT_MODEL", "ProsusAI/finbert")
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "transformers").lower()
+
+
+class SentimentBackend:
+    """Scores texts; every backend returns [{"label", "score"}] in input order"""
+    name = "base"
+
+    def __init__(self, model: str = FINBERT_MODEL):
+        self.model = model
+        self._pipe = self._build_pipeline()
+
+    def _build_pipeline(self):
+        raise NotImplementedError
+
+    def predict(self, texts: List[str], batch_size: int, max_length: int) -> List[Dict]:
+        return self._pipe(texts, batch_size=batch_size, truncation=True, max_length=max_length)
+
+
+class TransformersBackend(SentimentBackend):
+    name = "transformers"
+
+    def _build_pipeline(self):
+        from transformers import pipeline
+        return pipeline("sentiment-analysis", model=self.model)
+
+
+class Int8Backend(SentimentBackend):
+    """Dynamic INT8 quantization of the Linear layers; CPU only"""
+    name = "int8"
+
+    def _build_pipeline(self):
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+        tokenizer = AutoTokenizer.from_pretrained(self.model)
+        model = AutoModelForSequenceClassification.from_pretrained(self.model)
+        model = torch.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=-1)
+
+
+class OnnxBackend(SentimentBackend):
+    """ONNX Runtime; exports the model on first load"""
+    name = "onnx"
+
+    def _build_pipeline(self):
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+        except ImportError as e:
+            raise ImportError(
+                "SENTIMENT_BACKEND=onnx needs optimum: pip install optimum[onnxruntime]"
+            ) from e
+        from transformers import AutoTokenizer, pipeline
+
+        tokenizer = AutoTokenizer.from_pretrained(self.model)
+        model = ORTModelForSequenceClassification.from_pretrained(self.model, export=True)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+
+BACKENDS = {
+    TransformersBackend.name: TransformersBackend,
+    Int8Backend.name: Int8Backend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def load_backend(name: str, model: str = FINBERT_MODEL) -> SentimentBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown SENTIMENT_BACKEND '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](model)
+
+
+def backend_cache_id(name: str = SENTIMENT_BACKEND, model: str = FINBERT_MODEL) -> str:
+    """Identifies model + backend in the sentiment cache (labels can differ slightly between backends)"""
+    return f"{model}:{name}"
+
+
+_finbert = None
+_finbert_lock = threading.Lock()
+_preload_thread: Optional[threading.Thread] = None
+_preload_lock = threading.Lock()
+
+
+def get_finbert() -> SentimentBackend:
+    """The shared FinBERT backend selected by SENTIMENT_BACKEND (loaded on first use)"""
+    global _finbert
+
+    if _finbert is None:
+        with _finbert_lock:
+            if _finbert is None:
+                _finbert = load_backend(SENTIMENT_BACKEND)
+
+    return _finbert
+
+
+def finbert_loaded() -> bool:
+    return _finbert is not None
+
+
+def preload_finbert(background: bool = True) -> Optional[threading.Thread]:
+    """
+    Warm the model ahead of the first sentiment query.
+
+    Only one background load is ever in flight: while it runs (or once the
+    model is up) later calls return the same thread instead of starting another.
+
+    Args:
+        background: load in a daemon thread and return it instead of blocking
+    """
+    global _preload_thread
+
+    if not background:
+        get_finbert()
+        return None
+
+    with _preload_lock:
+        # a finished thread whose load failed may be retried
+        if _preload_thread is None or not (_preload_thread.is_alive() or finbert_loaded()):
+            _preload_thread = threading.Thread(target=get_finbert, name="finbert-preload", daemon=True)
+            _preload_thread.start()
+        return _preload_thread
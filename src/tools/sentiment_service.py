@@ -0,0 +1,133 @@
+# src/tools/sentiment_service.py
+"""
+In-process micro-batching front end for FinBERT.
+
+Streamlit runs every browser session as a thread of the same process, so
+one shared service sees the texts of all of them. Callers get futures
+back; a single worker thread drains the queue and runs one forward pass
+per batch, cut when it reaches SENTIMENT_BATCH_SIZE texts or when the
+oldest queued text has waited SENTIMENT_MAX_WAIT_MS. Under load that
+means a few large batches instead of many small competing ones.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from tools.sentiment_model import get_finbert
+
+# Texts scored per forward pass; tune for the host (CPU: 8-32)
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "16"))
+# How long the first queued text waits for others to join its batch
+SENTIMENT_MAX_WAIT_MS = float(os.getenv("SENTIMENT_MAX_WAIT_MS", "20"))
+# FinBERT's context size; longer texts are truncated by the tokenizer
+SENTIMENT_MAX_TOKENS = 512
+
+
+class SentimentService:
+    def __init__(self, max_batch_size: int = SENTIMENT_BATCH_SIZE,
+                 max_wait_ms: float = SENTIMENT_MAX_WAIT_MS, backend=None):
+        """
+        Args:
+            max_batch_size: texts per forward pass
+            max_wait_ms: deadline for filling a batch, counted from its first text
+            backend: SentimentBackend to use (default: the shared get_finbert())
+        """
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._backend = backend
+        self._queue = queue.Queue()
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._texts = 0
+
+        self._worker = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self._worker.start()
+
+    # --------------------------------------------------
+    # CLIENT SIDE
+    # --------------------------------------------------
+    def submit(self, texts: List[str]) -> List[Future]:
+        """Queue texts; each future resolves to {"label", "score"}"""
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def score(self, texts: List[str], timeout: Optional[float] = None) -> List[Dict]:
+        """Blocking submit(): results in input order"""
+        return [f.result(timeout=timeout) for f in self.submit(texts)]
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "texts": self._texts,
+                "avg_batch_size": round(self._texts / self._batches, 2) if self._batches else 0.0,
+                "queued": self._queue.qsize(),
+            }
+
+    # --------------------------------------------------
+    # WORKER
+    # --------------------------------------------------
+    def _next_batch(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        from tools.sentiment_cache import get_sentiment_cache
+
+        while True:
+            batch = [(t, f) for t, f in self._next_batch() if f.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            # sessions asking about the same stock often queue the same headline
+            unique = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                backend = self._backend or get_finbert()
+                started = time.perf_counter()
+                results = backend.predict(unique, batch_size=len(unique), max_length=SENTIMENT_MAX_TOKENS)
+                get_sentiment_cache().record_inference(len(unique), time.perf_counter() - started)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            scored = {text: {"label": r["label"], "score": float(r["score"])} for text, r in zip(unique, results)}
+            for text, future in batch:
+                future.set_result(dict(scored[text]))
+
+            with self._stats_lock:
+                self._batches += 1
+                self._texts += len(unique)
+
+
+# Convenience accessor
+_service_instance = None
+_service_lock = threading.Lock()
+
+def get_sentiment_service() -> SentimentService:
+    global _service_instance
+
+    if _service_instance is None:
+        with _service_lock:
+            if _service_instance is None:
+                _service_instance = SentimentService()
+
+    return _service_instance
@@ -0,0 +1,135 @@
+# src/tools/social_fixtures.py
+"""
+Recorded-fixture stand-ins for the tweepy and praw clients.
+
+The stubs answer the two calls tools.social_ingestor makes
+(search_recent_tweets / subreddit(...).search) from a JSON file, honouring
+since_id / before cursors, next_token paging and result limits, so the ingestion path can run offline.
+
+Fixture layout:
+    {
+      "twitter": {"<stock>": [{"id", "text", "created_at" (ISO)}]},
+      "reddit":  {"<stock>": [{"fullname", "title", "selftext", "url",
+                              "subreddit", "created_utc"}]}
+    }
+
+Record one from the live APIs (from src/):
+    python -m tools.social_fixtures fixtures.json Infosys TCS
+"""
+
+import argparse
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List
+
+
+def _match(stocks: Dict[str, list], query: str) -> list:
+    query = query.lower()
+    return next((items for stock, items in stocks.items() if stock.lower() in query), [])
+
+
+class FixtureTwitterClient:
+    def __init__(self, tweets: Dict[str, List[dict]]):
+        self.tweets = tweets
+        self.calls = []
+
+    def search_recent_tweets(self, query: str, max_results: int = 10, tweet_fields=None, since_id=None,
+                             pagination_token=None, **kwargs):
+        self.calls.append({"query": query, "since_id": since_id, "pagination_token": pagination_token})
+        items = sorted(_match(self.tweets, query), key=lambda t: int(t["id"]), reverse=True)
+        if since_id is not None:
+            items = [t for t in items if int(t["id"]) > int(since_id)]
+        offset = int(pagination_token or 0)
+        page = items[offset:offset + max_results]
+
+        data = [
+            SimpleNamespace(id=int(t["id"]), text=t["text"], created_at=datetime.fromisoformat(t["created_at"]))
+            for t in page
+        ]
+        meta = {"result_count": len(data)}
+        if data:
+            meta["newest_id"] = str(data[0].id)
+        if offset + max_results < len(items):
+            meta["next_token"] = str(offset + max_results)
+        return SimpleNamespace(data=data or None, meta=meta)
+
+
+class FixtureRedditClient:
+    def __init__(self, posts: Dict[str, List[dict]]):
+        self.posts = posts
+        self.calls = []
+
+    def subreddit(self, name: str):
+        return SimpleNamespace(search=self._search)
+
+    def _search(self, query: str, sort: str = "new", time_filter: str = "week", limit: int = 5,
+                params=None, **kwargs):
+        before = (params or {}).get("before")
+        self.calls.append({"query": query, "limit": limit, "before": before})
+        items = sorted(_match(self.posts, query), key=lambda p: p["created_utc"], reverse=True)
+        if before is not None:
+            # like Reddit: the `limit` posts right after `before`, nothing if it is unknown
+            anchor = next((i for i, p in enumerate(items) if p["fullname"] == before), 0)
+            items = items[max(anchor - limit, 0):anchor]
+        items = items[:limit]
+        return [
+            SimpleNamespace(
+                fullname=p["fullname"],
+                title=p["title"],
+                selftext=p.get("selftext", ""),
+                url=p.get("url", ""),
+                created_utc=p["created_utc"],
+                subreddit=SimpleNamespace(display_name=p.get("subreddit", "stocks")),
+            )
+            for p in items
+        ]
+
+
+def fixture_clients(path: str) -> dict:
+    """{"twitter": ..., "reddit": ...} stubs loaded from a fixture file"""
+    with open(path, "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+    return {
+        "twitter": FixtureTwitterClient(fixture.get("twitter", {})),
+        "reddit": FixtureRedditClient(fixture.get("reddit", {})),
+    }
+
+
+def record_fixture(path: str, stocks: List[str]):
+    """Capture live API responses for `stocks` into a fixture file"""
+    from tools.social_ingestor import REDDIT_SUBREDDITS, get_reddit_client, get_twitter_client
+
+    fixture = {"twitter": {}, "reddit": {}}
+    for stock in stocks:
+        response = get_twitter_client().search_recent_tweets(
+            query=f'("{stock}" OR ${stock}) (stock OR price OR news) lang:en -is:retweet',
+            max_results=100,
+            tweet_fields=['created_at', 'text']
+        )
+        fixture["twitter"][stock] = [
+            {"id": str(t.id), "text": t.text, "created_at": t.created_at.isoformat()}
+            for t in (response.data or [])
+        ]
+
+        results = get_reddit_client().subreddit(REDDIT_SUBREDDITS).search(
+            f'"{stock}"', sort="new", time_filter="week", limit=100
+        )
+        fixture["reddit"][stock] = [
+            {
+                "fullname": p.fullname, "title": p.title, "selftext": p.selftext, "url": p.url,
+                "subreddit": p.subreddit.display_name, "created_utc": p.created_utc,
+            }
+            for p in results
+        ]
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record a social API fixture")
+    parser.add_argument("path")
+    parser.add_argument("stocks", nargs="+")
+    args = parser.parse_args()
+    record_fixture(args.path, args.stocks)
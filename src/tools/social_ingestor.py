@@ -0,0 +1,398 @@
+# src/tools/social_ingestor.py
+"""
+Incremental Reddit / Twitter ingestion into the local social store.
+
+Each (stock, source) keeps a cursor - the newest tweet id (Twitter
+`since_id`) or the newest post fullname (Reddit) - so a poll only pulls
+items newer than the last one stored. A background thread re-polls every
+recently requested stock every SOCIAL_POLL_SECONDS, which lets
+get_social_news answer from SQLite instead of the APIs.
+
+Set SOCIAL_FIXTURES_PATH to replay recorded responses instead of calling
+the APIs (see tools.social_fixtures).
+
+Usage (from src/):
+    python -m tools.social_ingestor Infosys TCS --once
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from tools.social_store import SocialStore, get_social_store, stock_key
+from utils.diagnostics import diag
+
+# Re-poll interval for tracked stocks; answers younger than this come straight from the store
+SOCIAL_POLL_SECONDS = int(os.getenv("SOCIAL_POLL_SECONDS", "300"))
+# Stop polling stocks nobody asked about for this long
+SOCIAL_TRACK_SECONDS = int(os.getenv("SOCIAL_TRACK_SECONDS", str(3 * 24 * 3600)))
+# Recent-search window of both APIs
+SOCIAL_WINDOW_SECONDS = 7 * 24 * 3600
+
+REDDIT_SUBREDDITS = "stocks+investing+IndianStreetBets+IndianStockMarket+StockMarket"
+REDDIT_LIMIT = 25
+TWEETS_PER_POLL = 10
+TWEETS_PER_PAGE = 100        # delta polls (API maximum)
+# Requests per source in one delta poll before the rest is left for later
+SOCIAL_MAX_PAGES = int(os.getenv("SOCIAL_MAX_PAGES", "5"))
+
+SOURCES = ("reddit", "twitter")
+
+# Env vars each source needs
+CREDENTIALS = {
+    "twitter": ("TWITTER_BEARER_TOKEN",),
+    "reddit": ("client_id", "client_secret", "user_agent"),
+}
+
+
+# --------------------------------------------------
+# CLIENTS
+# --------------------------------------------------
+# Clients (and tweepy / praw themselves) are built on first use, so
+# importing this module costs nothing for users who never ask for social news
+_twitter_client = None
+_reddit_client = None
+_twitter_lock = threading.Lock()
+_reddit_lock = threading.Lock()
+
+
+def missing_credentials() -> Dict[str, List[str]]:
+    """Unset env vars per source (empty list = source configured)"""
+    return {
+        source: [name for name in names if not os.getenv(name)]
+        for source, names in CREDENTIALS.items()
+    }
+
+def get_twitter_client():
+    """Shared Twitter API v2 client"""
+    global _twitter_client
+
+    if _twitter_client is None:
+        with _twitter_lock:
+            if _twitter_client is None:
+                import tweepy
+                _twitter_client = tweepy.Client(bearer_token=os.getenv("TWITTER_BEARER_TOKEN"))
+
+    return _twitter_client
+
+def get_reddit_client():
+    """Shared read-only Reddit client"""
+    global _reddit_client
+
+    if _reddit_client is None:
+        with _reddit_lock:
+            if _reddit_client is None:
+                import praw
+                _reddit_client = praw.Reddit(
+                    client_id=os.getenv("client_id"),
+                    client_secret=os.getenv("client_secret"),
+                    user_agent=os.getenv("user_agent")
+                )
+
+    return _reddit_client
+
+
+# --------------------------------------------------
+# SOURCES
+# --------------------------------------------------
+def _reddit_post(post) -> Dict:
+    return {
+        "post_id": post.fullname,
+        "created_at": float(post.created_utc),
+        "title": post.title,
+        "content": (post.selftext[:250] + "...") if len(post.selftext) > 800 else (post.selftext or "[Link/Image Post]"),
+        "url": post.url,
+        "community": f"r/{post.subreddit.display_name}"
+    }
+
+def _search_reddit(client, stock_name: str, limit: int, before: Optional[str] = None):
+    # query "Infosys" works better than natural sentences; with sort="new",
+    # before=<fullname> returns the `limit` posts right after that one
+    return client.subreddit(REDDIT_SUBREDDITS).search(
+        f'"{stock_name}"',
+        sort="new",
+        time_filter="week",
+        limit=limit,
+        params={"before": before} if before else {}
+    )
+
+def fetch_reddit(client, stock_name: str, cursor: Optional[str] = None,
+                 since: Optional[float] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Posts newer than `cursor` (a fullname), newest first.
+
+    A delta poll pages forward from the cursor (before=<newest so far>), at
+    most SOCIAL_MAX_PAGES requests; anything beyond that is picked up by the
+    next poll, which starts from the newest post fetched here. An empty
+    before= answer can also mean the cursor post was deleted, so the newest
+    posts are then checked against `since` (newest stored post time) instead.
+
+    Returns:
+        (posts, newest fullname or None if nothing new)
+    """
+    if not cursor:
+        posts = [_reddit_post(p) for p in _search_reddit(client, stock_name, 5)]
+        return posts, posts[0]["post_id"] if posts else None
+
+    def newer(post, stop: str) -> bool:
+        # also stops an API that ignores `before` (or pages on past it) at the cursor
+        return post.fullname != stop and post.fullname not in seen and (since is None or post.created_utc > since)
+
+    pages, seen, anchor = [], set(), cursor
+    for _ in range(SOCIAL_MAX_PAGES):
+        page = []
+        for post in _search_reddit(client, stock_name, REDDIT_LIMIT, before=anchor):
+            if not newer(post, anchor):
+                break
+            page.append(post)
+            seen.add(post.fullname)
+        if not page:
+            break
+        pages.insert(0, page)
+        anchor = page[0].fullname
+        if len(page) < REDDIT_LIMIT:
+            break
+    else:
+        diag("social.behind", lambda: {"stock": stock_name, "source": "reddit", "fetched": len(seen)}, level="INFO")
+
+    if not pages:
+        # nothing after the cursor: either nothing is new or the cursor post is gone
+        page = []
+        for post in _search_reddit(client, stock_name, REDDIT_LIMIT):
+            if not newer(post, cursor):
+                break
+            page.append(post)
+        if len(page) == REDDIT_LIMIT:
+            diag("social.gap", lambda: {
+                "stock": stock_name, "source": "reddit", "cursor": cursor, "since": since,
+                "oldest_fetched": float(page[-1].created_utc),
+            }, level="WARNING")
+        pages = [page]
+
+    posts = [_reddit_post(post) for page in pages for post in page]
+    return posts, posts[0]["post_id"] if posts else None
+
+def fetch_twitter(client, stock_name: str, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Tweets newer than `cursor` (since_id), newest first.
+
+    Recent search pages from the newest tweet back towards since_id, so a
+    delta poll follows next_token until it reaches the cursor (at most
+    SOCIAL_MAX_PAGES pages). Tweets still left between the last page and the
+    cursor can't be fetched later, since the cursor moves to the newest
+    tweet, so that gap is recorded as a social.gap event.
+
+    Returns:
+        (posts, newest tweet id or None if nothing new)
+    """
+    # Query for name OR cashtag with financial context keywords
+    query = f'("{stock_name}" OR ${stock_name}) (stock OR price OR news) lang:en -is:retweet'
+    params = {"since_id": cursor} if cursor else {}
+
+    tweets, newest, token = [], None, None
+    for _ in range(SOCIAL_MAX_PAGES if cursor else 1):
+        response = client.search_recent_tweets(
+            query=query,
+            max_results=TWEETS_PER_PAGE if cursor else TWEETS_PER_POLL,
+            tweet_fields=['created_at', 'text'],
+            **(dict(params, pagination_token=token) if token else params)
+        )
+        meta = getattr(response, "meta", None) or {}
+        tweets += response.data or []
+        newest = newest or meta.get("newest_id")
+        token = meta.get("next_token")
+        if not token:
+            break
+    else:
+        if cursor:
+            diag("social.gap", lambda: {
+                "stock": stock_name, "source": "twitter", "cursor": cursor,
+                "oldest_fetched": str(tweets[-1].id),
+            }, level="WARNING")
+
+    if not tweets:
+        return [], None
+
+    posts = [{
+        "post_id": str(tweet.id),
+        "created_at": tweet.created_at.timestamp(),
+        "title": f"Tweet on {tweet.created_at.strftime('%Y-%m-%d')}",
+        "content": tweet.text.replace('\n', ' '),
+        "url": f"https://twitter.com/twitter/status/{tweet.id}",
+        "community": "X / Twitter"
+    } for tweet in tweets]
+    newest = newest or max(posts, key=lambda p: int(p["post_id"]))["post_id"]
+    return posts, str(newest)
+
+FETCHERS = {
+    "reddit": fetch_reddit,
+    "twitter": fetch_twitter,
+}
+
+
+# --------------------------------------------------
+# INGESTOR
+# --------------------------------------------------
+class SocialIngestor:
+    def __init__(self, store: Optional[SocialStore] = None, clients: Optional[Dict] = None):
+        """
+        Args:
+            store: where posts and cursors live (default: the shared social store)
+            clients: {"reddit": ..., "twitter": ...} to use instead of the real
+                     API clients, e.g. tools.social_fixtures stubs
+        """
+        self.store = store or get_social_store()
+        self.clients = clients
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="social-poll")
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._thread = None
+
+    def client(self, source: str):
+        if self.clients is not None:
+            return self.clients[source]
+        return get_twitter_client() if source == "twitter" else get_reddit_client()
+
+    def available(self) -> Dict[str, bool]:
+        if self.clients is not None:
+            return {source: source in self.clients for source in SOURCES}
+        return {source: not names for source, names in missing_credentials().items()}
+
+    def poll_source(self, stock_name: str, source: str) -> int:
+        """Pull items newer than the stored cursor; returns how many were new"""
+        state = self.store.get_cursor(stock_name, source)
+        cursor = state["cursor"] if state else None
+        if state and time.time() - state["last_poll"] > SOCIAL_WINDOW_SECONDS - 3600:
+            # outside the recent-search window the API rejects (or ignores) old cursors
+            cursor = None
+
+        kwargs = {}
+        if source == "reddit" and cursor:
+            # time bound for when the cursor post no longer exists
+            latest = self.store.recent(stock_name, source, max_age=SOCIAL_WINDOW_SECONDS, limit=1)
+            kwargs["since"] = latest[0]["created_at"] if latest else None
+
+        posts, newest = FETCHERS[source](self.client(source), stock_name, cursor, **kwargs)
+        self.store.add_posts(stock_name, source, posts)
+        self.store.set_cursor(stock_name, source, newest)
+        return len(posts)
+
+    def _submit(self, stock_name: str, source: str):
+        """One poll per (stock, source) at a time; concurrent callers share it"""
+        key = (stock_key(stock_name), source)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self.poll_source, stock_name, source)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def poll(self, stock_name: str, timeout: Optional[float] = None, max_age: float = 0) -> Dict[str, str]:
+        """
+        Poll every source concurrently under one shared deadline.
+
+        Args:
+            max_age: skip sources polled less than this many seconds ago
+
+        Returns:
+            {source: "ok" | "fresh" | "error" | "timeout" | "no_credentials"};
+            a timed-out poll keeps running and lands in the store later
+        """
+        status, futures = {}, {}
+        available = self.available()
+        for source in SOURCES:
+            if not available[source]:
+                status[source] = "no_credentials"
+                continue
+            state = self.store.get_cursor(stock_name, source)
+            if state and time.time() - state["last_poll"] < max_age:
+                status[source] = "fresh"
+                continue
+            futures[source] = self._submit(stock_name, source)
+
+        wait(futures.values(), timeout=timeout)
+        for source, future in futures.items():
+            if not future.done():
+                status[source] = "timeout"
+            elif future.exception() is not None:
+                err = str(future.exception())
+                diag("social.poll_failed", lambda: {"stock": stock_name, "source": source, "error": err},
+                     level="WARNING")
+                status[source] = "error"
+            else:
+                status[source] = "ok"
+        return status
+
+    # --------------------------------------------------
+    # BACKGROUND LOOP
+    # --------------------------------------------------
+    def poll_tracked(self, timeout: Optional[float] = None):
+        """One pass over every recently requested stock"""
+        for stock in self.store.tracked(SOCIAL_TRACK_SECONDS):
+            self.poll(stock, timeout=timeout, max_age=SOCIAL_POLL_SECONDS)
+        self.store.prune(SOCIAL_WINDOW_SECONDS)
+
+    def _run(self, interval: float):
+        while True:
+            try:
+                self.poll_tracked()
+            except Exception as e:
+                err = str(e)
+                diag("social.ingest_failed", lambda: {"error": err}, level="WARNING")
+            time.sleep(interval)
+
+    def start(self, interval: float = SOCIAL_POLL_SECONDS) -> threading.Thread:
+        """Start the background poller (once per ingestor)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, args=(interval,), name="social-ingestor", daemon=True
+                )
+                self._thread.start()
+        return self._thread
+
+
+# Convenience accessor
+_ingestor_instance = None
+_ingestor_lock = threading.Lock()
+
+def get_social_ingestor() -> SocialIngestor:
+    global _ingestor_instance
+
+    if _ingestor_instance is None:
+        with _ingestor_lock:
+            if _ingestor_instance is None:
+                clients = None
+                if os.getenv("SOCIAL_FIXTURES_PATH"):
+                    from tools.social_fixtures import fixture_clients
+                    clients = fixture_clients(os.getenv("SOCIAL_FIXTURES_PATH"))
+                _ingestor_instance = SocialIngestor(clients=clients)
+
+    return _ingestor_instance
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll Reddit / Twitter into the local social store")
+    parser.add_argument("stocks", nargs="*", help="stocks to track (default: recently requested ones)")
+    parser.add_argument("--once", action="store_true", help="poll once and exit")
+    parser.add_argument("--interval", type=float, default=SOCIAL_POLL_SECONDS)
+    args = parser.parse_args()
+
+    ingestor = get_social_ingestor()
+    for stock in args.stocks:
+        ingestor.store.track(stock)
+
+    while True:
+        for stock in ingestor.store.tracked(SOCIAL_TRACK_SECONDS):
+            print(stock, ingestor.poll(stock, max_age=0 if args.once else args.interval))
+        if args.once:
+            break
+        time.sleep(args.interval)
@@ -1,44 +1,37 @@
-import datetime
-import tweepy
-import praw
 from typing import List, Dict
 from dotenv import load_dotenv
 import os
 load_dotenv()
 
+from tools.social_ingestor import (
+    SOCIAL_POLL_SECONDS,
+    SOCIAL_WINDOW_SECONDS,
+    fetch_reddit,
+    fetch_twitter,
+    get_reddit_client,
+    get_social_ingestor,
+    get_twitter_client,
+)
+from utils.diagnostics import diag
+
 # --- CONFIGURATION ---
-TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
+# Shared deadline (seconds) for all social sources in one get_social_news call
+SOCIAL_FETCH_TIMEOUT = float(os.getenv("SOCIAL_FETCH_TIMEOUT", "8"))
+# Poll tracked stocks in a background thread (set to 0 to poll only on request)
+SOCIAL_BACKGROUND_POLL = os.getenv("SOCIAL_BACKGROUND_POLL", "1") == "1"
 
-# Twitter API v2 Client
-twitter_client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN)
+# Posts returned per source, newest first
+POST_LIMITS = {"reddit": 5, "twitter": 10}
+SOURCE_LABELS = {"reddit": "Reddit", "twitter": "Twitter"}
+
+POST_FIELDS = ("title", "content", "url", "community")
 
-# Reddit Client
-reddit_client = praw.Reddit(
-    client_id=os.getenv("client_id"),
-    client_secret=os.getenv("client_secret"),
-    user_agent=os.getenv("user_agent")
-)
 
 def fetch_reddit_posts(stock_name: str) -> List[Dict]:
     """Fetches posts from specific finance subreddits with body text."""
     try:
-        # Search relevant subreddits only
-        target_subs = "stocks+investing+IndianStreetBets+IndianStockMarket+StockMarket"
-        # query "Infosys" works better than natural sentences
-        search_results = reddit_client.subreddit(target_subs).search(
-            f'"{stock_name}"',
-            sort="new",
-            time_filter="week",
-            limit=5
-        )
-        
-        return [{
-            "source": "Reddit",
-            "title": post.title,
-            "content": (post.selftext[:250] + "...") if len(post.selftext) > 800 else (post.selftext or "[Link/Image Post]"),
-            "url": post.url,
-            "community": f"r/{post.subreddit.display_name}"
-        } for post in search_results]
+        posts, _ = fetch_reddit(get_reddit_client(), stock_name)
+        return [{"source": "Reddit", **{k: p[k] for k in POST_FIELDS}} for p in posts]
     except Exception as e:
         print(f"Reddit Error: {e}")
         return []
@@ -46,41 +39,38 @@ def fetch_reddit_posts(stock_name: str) -> List[Dict]:
 def fetch_twitter_posts(stock_name: str) -> List[Dict]:
     """Fetches high-quality financial tweets from the last 7 days."""
     try:
-        # Query for name OR cashtag with financial context keywords
-        query = f'("{stock_name}" OR ${stock_name}) (stock OR price OR news) lang:en -is:retweet'
-        
-        response = twitter_client.search_recent_tweets(
-            query=query,
-            max_results=10,
-            tweet_fields=['created_at', 'text']
-        )
-        
-        if not response.data:
-            return []
-            
-        return [{
-            "source": "Twitter",
-            "title": f"Tweet on {tweet.created_at.strftime('%Y-%m-%d')}",
-            "content": tweet.text.replace('\n', ' '),
-            "url": f"https://twitter.com/twitter/status/{tweet.id}",
-            "community": "X / Twitter"
-        } for tweet in response.data]
+        posts, _ = fetch_twitter(get_twitter_client(), stock_name)
+        return [{"source": "Twitter", **{k: p[k] for k in POST_FIELDS}} for p in posts]
     except Exception as e:
         print(f"Twitter Error: {e}")
         return []
 
-def get_social_news(stock_name: str):
-    print(f"\n{'='*60}")
-    print(f"SOCIAL MEDIA ANALYSIS FOR: {stock_name.upper()}")
-    print(f"{'='*60}")
+def get_social_news(stock_name: str, timeout: float = SOCIAL_FETCH_TIMEOUT) -> Dict:
+    """
+    Recent Reddit and Twitter posts, read from the local social store.
 
-    # Fetch Data
-    reddit_news = fetch_reddit_posts(stock_name)
-    try:
-        twitter_news = fetch_twitter_posts(stock_name)
-    except:
-        twitter_news = ""
+    Sources not polled in the last SOCIAL_POLL_SECONDS are brought up to
+    date first (only items newer than the stored cursor, both sources
+    concurrently under one shared deadline); the stock is then kept fresh
+    by the background ingestor.
+
+    Returns:
+        {"posts": [...], "sources": {"reddit": status, "twitter": status}}
+        where status is "fresh", "ok", "error", "timeout" or "no_credentials";
+        posts holds whatever is stored once the deadline passes
+    """
+    diag("social.start", lambda: {"stock": stock_name}, level="INFO")
+
+    ingestor = get_social_ingestor()
+    ingestor.store.track(stock_name)
+    if SOCIAL_BACKGROUND_POLL:
+        ingestor.start()
 
-    all_news = reddit_news + twitter_news
+    status = ingestor.poll(stock_name, timeout=timeout, max_age=SOCIAL_POLL_SECONDS)
 
-    return [all_news]
+    all_news = [
+        {"source": SOURCE_LABELS[source], **{k: p[k] for k in POST_FIELDS}}
+        for source, limit in POST_LIMITS.items()
+        for p in ingestor.store.recent(stock_name, source, max_age=SOCIAL_WINDOW_SECONDS, limit=limit)
+    ]
+    return {"posts": all_news, "sources": status}
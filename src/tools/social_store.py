@@ -0,0 +1,155 @@
+# src/tools/social_store.py
+"""
+Local store for ingested social posts (SQLite).
+
+Holds the posts pulled by tools.social_ingestor, one cursor per
+(stock, source) marking the newest item already seen, and the list of
+stocks users have asked about so the ingestor knows what to poll.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+SOCIAL_STORE_PATH = os.getenv(
+    "SOCIAL_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "stock_cache", "social.sqlite")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS social_posts (
+    stock TEXT NOT NULL,
+    source TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    title TEXT,
+    content TEXT,
+    url TEXT,
+    community TEXT,
+    PRIMARY KEY (stock, source, post_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS social_posts_recent ON social_posts (stock, source, created_at);
+
+CREATE TABLE IF NOT EXISTS social_cursors (
+    stock TEXT NOT NULL,
+    source TEXT NOT NULL,
+    cursor TEXT,
+    last_poll REAL NOT NULL,
+    PRIMARY KEY (stock, source)
+);
+
+CREATE TABLE IF NOT EXISTS social_tracked (
+    stock TEXT PRIMARY KEY,
+    last_requested REAL NOT NULL
+);
+"""
+
+POST_COLUMNS = ["post_id", "created_at", "title", "content", "url", "community"]
+
+
+def stock_key(stock_name: str) -> str:
+    return " ".join(stock_name.split()).lower()
+
+
+class SocialStore:
+    def __init__(self, path: str = SOCIAL_STORE_PATH):
+        """
+        Args:
+            path: SQLite file to keep posts and cursors in (created on first use)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # --------------------------------------------------
+    # POSTS
+    # --------------------------------------------------
+    def add_posts(self, stock: str, source: str, posts: List[Dict]):
+        """Insert posts ({post_id, created_at, title, content, url, community}); known ids are replaced"""
+        rows = [(stock_key(stock), source, *(p.get(c) for c in POST_COLUMNS)) for p in posts]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO social_posts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def recent(self, stock: str, source: str, max_age: float, limit: int) -> List[Dict]:
+        """Newest posts first, at most `max_age` seconds old"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(POST_COLUMNS)} FROM social_posts "
+                "WHERE stock=? AND source=? AND created_at >= ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (stock_key(stock), source, time.time() - max_age, limit)
+            ).fetchall()
+        return [dict(zip(POST_COLUMNS, row)) for row in rows]
+
+    def prune(self, max_age: float):
+        """Drop posts older than `max_age` seconds"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM social_posts WHERE created_at < ?", (time.time() - max_age,))
+
+    # --------------------------------------------------
+    # CURSORS
+    # --------------------------------------------------
+    def get_cursor(self, stock: str, source: str) -> Optional[dict]:
+        """{cursor, last_poll} or None if the source was never polled for this stock"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor, last_poll FROM social_cursors WHERE stock=? AND source=?",
+                (stock_key(stock), source)
+            ).fetchone()
+        return {"cursor": row[0], "last_poll": row[1]} if row else None
+
+    def set_cursor(self, stock: str, source: str, cursor: Optional[str]):
+        """Record a poll; a None cursor keeps the previous one"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO social_cursors (stock, source, cursor, last_poll) VALUES (?, ?, ?, ?)
+                ON CONFLICT (stock, source) DO UPDATE SET
+                    cursor = COALESCE(excluded.cursor, social_cursors.cursor),
+                    last_poll = excluded.last_poll
+                """,
+                (stock_key(stock), source, cursor, time.time())
+            )
+
+    # --------------------------------------------------
+    # TRACKED STOCKS
+    # --------------------------------------------------
+    def track(self, stock: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO social_tracked VALUES (?, ?)",
+                (stock_key(stock), time.time())
+            )
+
+    def tracked(self, max_age: float) -> List[str]:
+        """Stocks requested within the last `max_age` seconds"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stock FROM social_tracked WHERE last_requested >= ? ORDER BY last_requested DESC",
+                (time.time() - max_age,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+
+# Convenience accessor
+_store_instance = None
+_store_lock = threading.Lock()
+
+def get_social_store() -> SocialStore:
+    global _store_instance
+
+    if _store_instance is None:
+        with _store_lock:
+            if _store_instance is None:
+                _store_instance = SocialStore()
+
+    return _store_instance
@@ -0,0 +1,91 @@
+# src/tools/ticker_info.py
+"""
+Shared, cached yf.Ticker(...).info snapshots.
+
+`.info` is the slowest yfinance call, so fundamentals, company profile and
+the screener all read from one snapshot per ticker. Each field has its own
+TTL: a caller only triggers a refetch when a field it actually needs has
+gone stale, and concurrent callers for the same ticker share one fetch.
+"""
+
+import threading
+import time
+from typing import Iterable, Optional
+
+import yfinance as yf
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# How long each .info field stays usable (seconds)
+FIELD_TTLS = {
+    "shortName": 7 * DAY,
+    "sector": 7 * DAY,
+    "industry": 7 * DAY,
+    "trailingEps": DAY,
+    "beta": DAY,
+    "trailingPE": 6 * HOUR,
+    "marketCap": 6 * HOUR,
+}
+DEFAULT_TTL = 6 * HOUR
+
+
+class TickerInfo:
+    """One `.info` payload and when it was fetched"""
+    __slots__ = ("ticker", "info", "fetched_at")
+
+    def __init__(self, ticker: str, info: dict, fetched_at: float):
+        self.ticker = ticker
+        self.info = info or {}
+        self.fetched_at = fetched_at
+
+    def get(self, field: str, default=None):
+        return self.info.get(field, default)
+
+    def is_fresh(self, fields: Iterable[str], now: Optional[float] = None) -> bool:
+        age = (now or time.time()) - self.fetched_at
+        return all(age < FIELD_TTLS.get(f, DEFAULT_TTL) for f in fields)
+
+
+_snapshots = {}
+_ticker_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _lock_for(ticker: str) -> threading.Lock:
+    with _registry_lock:
+        return _ticker_locks.setdefault(ticker, threading.Lock())
+
+
+def get_ticker_info(ticker: str, fields: Optional[Iterable[str]] = None) -> TickerInfo:
+    """
+    Cached `.info` snapshot for `ticker`.
+
+    Args:
+        fields: the fields the caller will read; the snapshot is refetched
+                only if one of them is past its TTL (all fields if omitted)
+
+    If a refetch fails but an older snapshot exists, the older one is returned.
+    """
+    fields = list(fields) if fields is not None else list(FIELD_TTLS)
+
+    snapshot = _snapshots.get(ticker)
+    if snapshot is not None and snapshot.is_fresh(fields):
+        return snapshot
+
+    # single flight: whoever holds the lock fetches, the rest reuse the result
+    with _lock_for(ticker):
+        snapshot = _snapshots.get(ticker)
+        if snapshot is not None and snapshot.is_fresh(fields):
+            return snapshot
+
+        try:
+            info = yf.Ticker(ticker).info
+        except Exception:
+            if snapshot is not None:
+                return snapshot
+            raise
+
+        snapshot = TickerInfo(ticker, info, time.time())
+        _snapshots[ticker] = snapshot
+        return snapshot
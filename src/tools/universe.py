@@ -0,0 +1,29 @@
+# src/tools/universe.py
+"""The tradable universe shipped in tools/stock_cache/nse_stocks.csv"""
+
+import csv
+import os
+from typing import List, Optional
+
+NSE_STOCKS_PATH = os.path.join(os.path.dirname(__file__), "stock_cache", "nse_stocks.csv")
+
+
+def load_nse_universe(path: str = NSE_STOCKS_PATH, series: Optional[str] = None) -> List[str]:
+    """
+    Yahoo tickers ("SYMBOL.NS") for every listed symbol.
+
+    Args:
+        series: keep only this NSE series, e.g. "EQ" (all series if omitted)
+    """
+    tickers = []
+    with open(path, "r", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        sym_col, series_col = header.index("SYMBOL"), header.index("SERIES")
+        for row in reader:
+            if not row:
+                continue
+            if series and row[series_col].strip() != series:
+                continue
+            tickers.append(row[sym_col].strip() + ".NS")
+    return tickers
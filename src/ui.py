@@ -1,5 +1,6 @@
 import streamlit as st
 import dotenv
+import os
 import time
 from datetime import datetime
 
@@ -29,6 +30,15 @@ from advisor.advisor_reasoner import (
 
 from risk.risk_engine import compute_risk_score
 from risk.explainer import explain_result
+from tools.sentiment_model import preload_finbert
+from utils.diagnostics import diag, setup_console_logging, start_request
+
+setup_console_logging()
+
+# FinBERT loads lazily on the first sentiment query; set PRELOAD_FINBERT=1
+# to warm it in the background while the UI starts instead
+if os.getenv("PRELOAD_FINBERT") == "1":
+    preload_finbert()
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -743,6 +753,8 @@ if user_input:
 
     # 3. Process with AI (Wrapped in Spinner for UI feedback)
     sf = st.session_state.sf
+    # tags this query's diagnostics (utils.diagnostics.request_events)
+    request_id = start_request()
 
     with st.chat_message("assistant", avatar="🤖"):
         with st.spinner("🔍 Analyzing market data..."):
@@ -782,7 +794,7 @@ if user_input:
                 # LOGIC: PLANNER
                 # -------------------------------------------------
                 context = plan_and_retrieve(slots)
-                print("context:", context)
+                diag("ui.context", lambda: {"context": context})
 
                 if "error" in context:
                     st.error(f"⚠️ Data retrieval error: {context['error']}")
@@ -859,7 +871,8 @@ if user_input:
                 st.markdown(response_text)
                 st.session_state.messages.append({
                     "role": "assistant", 
-                    "content": response_text
+                    "content": response_text,
+                    "request_id": request_id
                 })
 
             except Exception as e:
@@ -0,0 +1,213 @@
+# src/utils/diagnostics.py
+"""
+Structured diagnostics channel (loguru).
+
+Pipeline stages record named events with a dict of fields instead of
+printing. Events carry the current request id (a contextvar set once per
+user query) and are kept in a bounded in-memory ring buffer per request,
+so one request's trail can be pulled up with request_events(request_id).
+
+Config (env):
+    DIAG_LEVEL        OFF (default), DEBUG, INFO or WARNING; events below it are dropped
+    DIAG_SAMPLE_RATE  share of requests captured, 0..1 (default 1.0)
+    DIAG_LOG_PATH     also append events as JSON lines to this file
+    DIAG_STDERR       1 = echo events to stderr
+
+Importing this module only adds its own sinks; entry points call
+setup_console_logging() once to keep events off loguru's default console
+handler.
+
+When an event is gated out (level or sampling) its fields callable is never
+invoked, so disabled diagnostics cost one comparison per call site.
+"""
+
+import os
+import sys
+import threading
+import uuid
+import zlib
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30}
+
+DIAG_LEVEL = os.getenv("DIAG_LEVEL", "OFF").upper()
+DIAG_SAMPLE_RATE = float(os.getenv("DIAG_SAMPLE_RATE", "1.0"))
+DIAG_LOG_PATH = os.getenv("DIAG_LOG_PATH")
+DIAG_STDERR = os.getenv("DIAG_STDERR") == "1"
+
+# Ring buffer bounds
+MAX_REQUESTS = 200
+MAX_EVENTS_PER_REQUEST = 500
+
+_min_level = LEVELS.get(DIAG_LEVEL)   # None = disabled
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+# Records carry this module instance's id, so our sinks only ever see our
+# own events (even if the module ends up imported twice under two names)
+_instance = uuid.uuid4().hex
+_diag = logger.bind(channel="diag", diag_id=_instance)
+
+
+# --------------------------------------------------
+# REQUEST IDS
+# --------------------------------------------------
+def start_request(request_id: Optional[str] = None) -> str:
+    """Tag everything recorded from this context on with a (new) request id"""
+    request_id = request_id or uuid.uuid4().hex[:12]
+    _request_id.set(request_id)
+    return request_id
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+# --------------------------------------------------
+# RING BUFFER SINK
+# --------------------------------------------------
+class RequestBuffer:
+    """Last MAX_REQUESTS requests' events, at most MAX_EVENTS_PER_REQUEST each"""
+
+    def __init__(self, max_requests: int = MAX_REQUESTS, max_events: int = MAX_EVENTS_PER_REQUEST):
+        self.max_requests = max_requests
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._requests = OrderedDict()
+
+    def write(self, message):
+        record = message.record
+        extra = record["extra"]
+        event = {
+            "time": record["time"].timestamp(),
+            "level": record["level"].name,
+            "event": extra["event"],
+            "request_id": extra["request_id"],
+            **extra["fields"],
+        }
+        with self._lock:
+            events = self._requests.get(extra["request_id"])
+            if events is None:
+                events = self._requests[extra["request_id"]] = deque(maxlen=self.max_events)
+                while len(self._requests) > self.max_requests:
+                    self._requests.popitem(last=False)
+            events.append(event)
+
+    def events(self, request_id: str, event: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            events = list(self._requests.get(request_id, ()))
+        return [e for e in events if event is None or e["event"] == event]
+
+    def request_ids(self) -> List[str]:
+        """Newest last"""
+        with self._lock:
+            return list(self._requests)
+
+
+_buffer = RequestBuffer()
+
+
+def _is_diag(record) -> bool:
+    return record["extra"].get("channel") == "diag"
+
+
+def _is_ours(record) -> bool:
+    return record["extra"].get("diag_id") == _instance
+
+
+def _add_sinks():
+    """Diagnostics sinks; other loguru handlers (including the default one) are left alone"""
+    if _min_level is None:
+        return
+    logger.add(_buffer.write, level="DEBUG", filter=_is_ours, format="{message}")
+    if DIAG_LOG_PATH:
+        logger.add(DIAG_LOG_PATH, level="DEBUG", filter=_is_ours, serialize=True, enqueue=True)
+    if DIAG_STDERR:
+        logger.add(
+            sys.stderr, level="DEBUG", filter=_is_ours,
+            format="<dim>{time:HH:mm:ss.SSS}</dim> [{extra[request_id]}] {message} {extra[fields]}"
+        )
+
+
+_add_sinks()
+
+
+_console_lock = threading.Lock()
+_console_configured = False
+
+def setup_console_logging():
+    """
+    Keep diagnostics out of loguru's default console handler (set DIAG_STDERR=1
+    to see them there). For entry points only (app.py, ui.py); safe to call on
+    every rerun. Does nothing if the default handler was already replaced.
+    """
+    global _console_configured
+
+    with _console_lock:
+        if _console_configured:
+            return
+        _console_configured = True
+        try:
+            logger.remove(0)
+        except ValueError:
+            return
+        logger.add(sys.stderr, level=os.getenv("LOG_LEVEL", "INFO"), filter=lambda r: not _is_diag(r))
+
+
+# --------------------------------------------------
+# RECORDING
+# --------------------------------------------------
+def _sampled(request_id: Optional[str]) -> bool:
+    if DIAG_SAMPLE_RATE >= 1.0:
+        return True
+    # whole requests are kept or dropped, so a captured trail is complete
+    key = request_id or threading.current_thread().name
+    return zlib.crc32(key.encode("utf-8")) % 10000 < DIAG_SAMPLE_RATE * 10000
+
+
+def diag_enabled(level: str = "DEBUG") -> bool:
+    """Would an event at `level` be recorded for the current request?"""
+    return (
+        _min_level is not None
+        and LEVELS[level] >= _min_level
+        and _sampled(_request_id.get())
+    )
+
+
+def diag(event: str, fields: Optional[Callable[[], Dict]] = None, level: str = "DEBUG"):
+    """
+    Record a diagnostics event for the current request.
+
+    Args:
+        event: event name, e.g. "risk.score"
+        fields: zero-argument callable returning the event's fields; only
+                called when the event is actually recorded
+        level: DEBUG, INFO or WARNING (failures the pipeline recovered from)
+    """
+    if _min_level is None or LEVELS[level] < _min_level:
+        return
+    request_id = _request_id.get()
+    if not _sampled(request_id):
+        return
+
+    _diag.log(
+        level, event,
+        event=event,
+        request_id=request_id or "-",
+        fields=fields() if fields else {},
+    )
+
+
+# --------------------------------------------------
+# QUERYING
+# --------------------------------------------------
+def request_events(request_id: str, event: Optional[str] = None) -> List[Dict]:
+    """Recorded events of one request, oldest first (optionally one event name only)"""
+    return _buffer.events(request_id, event)
+
+
+def recent_request_ids() -> List[str]:
+    """Request ids still in the ring buffer, newest last"""
+    return _buffer.request_ids()